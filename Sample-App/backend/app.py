@@ -1,16 +1,22 @@
 # app.py
+from dotenv import load_dotenv
+
+load_dotenv()  # before the imports below, which read settings from the environment
+
 from flask import Flask, g 
 from flask_cors import CORS
+import click
 from routes.schools import school_bp
 from routes.users import user_bp, init_oauth
 from routes.health import health_bp
-from utils.db import get_db
+from utils.db import release_db
+from utils.compress import init_compression
+from utils.json_provider import init_json
 from models.user_model import ensure_schema
-from dotenv import load_dotenv
+from services.data_fetcher import get_schools, refresh_datasets, warm_start
+from services.geocoder import precompute
 import os
 
-load_dotenv()
-
 def create_app():
     app = Flask(__name__)
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-secret-change-me")
@@ -40,6 +46,10 @@ def create_app():
         ],
     )
 
+    # orjson-backed JSON (stdlib fallback) + gzip / brotli for large responses
+    init_json(app)
+    init_compression(app)
+
     # Initialize OAuth (must be done BEFORE registering blueprints)
     init_oauth(app)
 
@@ -47,6 +57,9 @@ def create_app():
     with app.app_context():
         ensure_schema()
 
+    # Serve the last snapshots right away instead of waiting on data.gov.sg
+    warm_start()
+
     # Register Blueprints
     app.register_blueprint(school_bp)
     app.register_blueprint(user_bp)
@@ -56,11 +69,27 @@ def create_app():
     def home():
         return {"message": "Backend is running!"}
 
+    @app.cli.command("geocode-schools")
+    @click.option("--workers", default=8, show_default=True, help="Concurrent OneMap requests.")
+    @click.option("--force", is_flag=True, help="Re-geocode postal codes already stored in app.db.")
+    def geocode_schools(workers, force):
+        """Geocode every school postal code into app.db ahead of time."""
+        postals = [s.get("postal_code") for s in get_schools()]
+        stats = precompute(postals, workers=workers, force=force)
+        click.echo(f"📍 Geocoded {stats['fetched']} of {stats['total']} postal codes "
+                   f"({stats['found']} found, {stats['failed']} failed)")
+
+    @app.cli.command("refresh-datasets")
+    def refresh_datasets_cmd():
+        """Download every data.gov.sg dataset and rewrite its on-disk snapshot."""
+        for name, count in refresh_datasets().items():
+            click.echo(f"💾 {name}: {count} rows")
+
     @app.teardown_appcontext
     def teardown_db(exception):
-        db = getattr(g, "db", None)
+        db = g.pop("db", None)
         if db is not None:
-            db.close()
+            release_db(db)
 
     return app
 
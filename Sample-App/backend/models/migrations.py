@@ -0,0 +1,142 @@
+# backend/models/migrations.py
+import sqlite3
+
+# ---------------------
+# Versioned schema migrations
+# ---------------------
+# app.db records the schema version it is at in PRAGMA user_version. Each
+# entry of MIGRATIONS upgrades the schema by one version and runs in its own
+# transaction together with the version bump, so a failed step leaves the
+# database at the previous version. A current database costs one PRAGMA read.
+#
+# Append new steps to the end; never edit one that has shipped.
+
+
+def _add_column(db, table: str, column: str, decl: str):
+    cols = {r[1] for r in db.execute(f"PRAGMA table_info({table})")}
+    if column not in cols:
+        db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _v1_baseline(db):
+    """The tables as they were before versioning (no-ops on older databases)."""
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS users(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            password_hash TEXT,
+            google_id TEXT UNIQUE,
+            address TEXT,
+            grades TEXT,
+            travel_distance_km REAL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS user_preferences(
+            user_id INTEGER PRIMARY KEY,
+            level TEXT,
+            max_distance_km REAL,
+            home_address TEXT,
+            pref_version INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS user_subjects(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            subject_name TEXT NOT NULL,
+            UNIQUE(user_id, subject_name),
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS user_ccas(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            cca_name TEXT NOT NULL,
+            UNIQUE(user_id, cca_name),
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS user_favorites(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            school_name TEXT NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS geocode_cache(
+            postal_code TEXT PRIMARY KEY,
+            lat REAL,
+            lon REAL,
+            fetched_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )""")
+    # columns added after the tables first shipped
+    _add_column(db, "user_preferences", "home_address", "TEXT")
+    _add_column(db, "user_preferences", "pref_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _v2_indexes(db):
+    """
+    - user_favorites: one row per (user, school), and an index for the
+      per-user lookups and ON DELETE CASCADE
+    - geocode_cache: WITHOUT ROWID, so a postal lookup is one b-tree search
+      instead of the primary-key index plus the table
+    (user_subjects / user_ccas are already covered by their UNIQUE indexes.)
+    """
+    db.execute("""
+        DELETE FROM user_favorites
+        WHERE id NOT IN (SELECT MIN(id) FROM user_favorites GROUP BY user_id, school_name)
+    """)
+    db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_user_favorites_user_school "
+               "ON user_favorites(user_id, school_name)")
+
+    db.execute("""
+        CREATE TABLE geocode_cache_v2(
+            postal_code TEXT PRIMARY KEY,
+            lat REAL,
+            lon REAL,
+            fetched_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID""")
+    db.execute("INSERT INTO geocode_cache_v2 SELECT postal_code, lat, lon, fetched_at, expires_at FROM geocode_cache")
+    db.execute("DROP TABLE geocode_cache")
+    db.execute("ALTER TABLE geocode_cache_v2 RENAME TO geocode_cache")
+
+
+MIGRATIONS = [
+    _v1_baseline,
+    _v2_indexes,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(db: sqlite3.Connection) -> int:
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db: sqlite3.Connection) -> int:
+    """Bring the database up to SCHEMA_VERSION; returns the version it ends at."""
+    if schema_version(db) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+    if db.in_transaction:
+        db.commit()
+
+    for target, step in enumerate(MIGRATIONS, start=1):
+        # IMMEDIATE + re-check: another process starting at the same time
+        # waits here and then finds the step already applied
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(db) >= target:
+                db.rollback()
+                continue
+            step(db)
+            db.execute(f"PRAGMA user_version = {target}")
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        print(f"🗄️ Migrated app.db to schema v{target}")
+    return SCHEMA_VERSION
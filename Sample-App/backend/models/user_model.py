@@ -1,17 +1,23 @@
 # backend/models/user_model.py
 # backend/models/user_model.py
+import json
+import os
+import time
+from utils.cache import get_cache
 from utils.db import get_db
-from flask import session
+from models.migrations import migrate
+from flask import g, session
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # ---------------------
 # User class
 # ---------------------
 class User:
-    def __init__(self, id, name, email):
+    def __init__(self, id, name, email, pref_version=0):
         self.id = id
         self.name = name
         self.email = email
+        self.pref_version = pref_version   # bumped on every preferences change
 
 
 # ---------------------
@@ -84,73 +90,82 @@ def verify_password(email: str, password: str):
     return User(row["id"], row["name"], row["email"])
 
 
-def current_user():
-    """Return the logged-in user from session, or None."""
-    db = get_db()
+# ---------------------
+# Current user resolution
+# ---------------------
+# The user is resolved at most once per request (memoized on flask.g). With
+# SESSION_CLAIMS_TTL_SEC > 0 the session cookie, which Flask signs with
+# SECRET_KEY, also carries a short-lived snapshot of the user, so hot
+# endpoints skip the users table until it expires. Changes made from another
+# session (e.g. saved preferences) show up once the snapshot is reissued.
+SESSION_CLAIMS_TTL_SEC = int(os.environ.get("SESSION_CLAIMS_TTL_SEC", "300"))
+
+_UNRESOLVED = object()
+
+_READ_USER_SQL = """
+    SELECT u.id, u.name, u.email, COALESCE(p.pref_version, 0) AS pref_version
+    FROM users u LEFT JOIN user_preferences p ON p.user_id = u.id
+    WHERE u.id = ?
+"""
+
+
+def _known_user():
+    """The user if it can be resolved without the database, else _UNRESOLVED."""
+    if "user" in g:
+        return g.user
     uid = session.get("uid")
     if not uid:
         return None
-    row = db.execute("SELECT id, name, email FROM users WHERE id=?", (uid,)).fetchone()
-    if not row:
-        return None
-    return User(row["id"], row["name"], row["email"])
+    claims = session.get("claims")
+    if claims and claims.get("id") == uid and claims.get("exp", 0) > time.time():
+        return User(claims["id"], claims["name"], claims["email"], claims.get("pv", 0))
+    return _UNRESOLVED
+
+
+def remember_user(user):
+    """Memoize the user for this request and (re)issue the session snapshot."""
+    g.user = user
+    if user and SESSION_CLAIMS_TTL_SEC > 0:
+        session["claims"] = {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "pv": user.pref_version,
+            "exp": int(time.time()) + SESSION_CLAIMS_TTL_SEC,
+        }
+
+
+def current_user():
+    """Return the logged-in user from session, or None."""
+    user = _known_user()
+    if user is _UNRESOLVED:
+        db = get_db()
+        row = db.execute(_READ_USER_SQL, (session["uid"],)).fetchone()
+        user = User(row["id"], row["name"], row["email"], row["pref_version"]) if row else None
+        remember_user(user)
+    g.user = user
+    return user
+
+
+def current_profile():
+    """(User, preferences) for the logged-in user in one query, or None."""
+    user = _known_user()
+    if user is _UNRESOLVED:
+        profile = read_profile(session["uid"])
+        remember_user(profile[0] if profile else None)
+        if profile:
+            _prefs_cache.set((profile[0].id, profile[0].pref_version), profile[1])
+        return profile
+    g.user = user
+    return (user, user_preferences(user)) if user else None
 
 
 # ---------------------
 # Database initialization
 # ---------------------
 def ensure_schema():
-    """Create all necessary tables"""
-    db = get_db()
-    db.executescript("""
-        CREATE TABLE IF NOT EXISTS users(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            password_hash TEXT,
-            google_id TEXT UNIQUE,
-            address TEXT,
-            grades TEXT,
-            travel_distance_km REAL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS user_preferences(
-            user_id INTEGER PRIMARY KEY,
-            level TEXT,
-            max_distance_km REAL,
-            home_address TEXT,
-            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-        
-        CREATE TABLE IF NOT EXISTS user_subjects(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            subject_name TEXT NOT NULL,
-            UNIQUE(user_id, subject_name),
-            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-        
-        CREATE TABLE IF NOT EXISTS user_ccas(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            cca_name TEXT NOT NULL,
-            UNIQUE(user_id, cca_name),
-            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-        
-        CREATE TABLE IF NOT EXISTS user_favorites(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            school_name TEXT NOT NULL,
-            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-    """)
-    try:
-        db.execute("SELECT home_address FROM user_preferences LIMIT 1;")
-    except:
-        db.execute("ALTER TABLE user_preferences ADD COLUMN home_address TEXT;")
-    db.commit()
+    """Create / upgrade all tables (see models/migrations.py)"""
+    migrate(get_db())
 
 
 # Alias for compatibility
@@ -160,54 +175,151 @@ init_db = ensure_schema
 # ---------------------
 # Preferences functions
 # ---------------------
+# Preferences come back in one round trip: subjects and CCAs are folded
+# into JSON arrays by correlated subqueries instead of separate SELECTs.
+#
+# Every change bumps user_preferences.pref_version (which the session
+# snapshot carries as "pv"), so a read for a known (user, version) is served
+# from memory. Treat the returned dicts as read-only.
+_prefs_cache = get_cache("preferences", ttl=3600, max_entries=10_000)   # (user id, pref_version) -> prefs
+
+_BUMP_PREF_VERSION_SQL = """
+    INSERT INTO user_preferences(user_id, pref_version) VALUES(?, 1)
+    ON CONFLICT(user_id) DO UPDATE SET pref_version = pref_version + 1
+"""
+_PREFS_COLUMNS = """
+    p.level, p.max_distance_km, p.home_address,
+    (SELECT json_group_array(subject_name) FROM user_subjects WHERE user_id = {uid}) AS subjects,
+    (SELECT json_group_array(cca_name) FROM user_ccas WHERE user_id = {uid}) AS ccas
+"""
+
+_READ_PREFERENCES_SQL = (
+    "SELECT" + _PREFS_COLUMNS.format(uid="k.user_id")
+    + " FROM (SELECT ? AS user_id) k LEFT JOIN user_preferences p ON p.user_id = k.user_id"
+)
+
+_READ_PROFILE_SQL = (
+    "SELECT u.id, u.name, u.email, COALESCE(p.pref_version, 0) AS pref_version,"
+    + _PREFS_COLUMNS.format(uid="u.id")
+    + " FROM users u LEFT JOIN user_preferences p ON p.user_id = u.id WHERE u.id = ?"
+)
+
+
+def _prefs_from_row(row) -> dict:
+    return {
+        "level": row["level"],
+        "max_distance_km": row["max_distance_km"],
+        "home_address": row["home_address"],
+        "subjects": json.loads(row["subjects"]),
+        "ccas": json.loads(row["ccas"]),
+    }
+
+
+def _clean_names(names) -> list[str]:
+    """Stripped, non-empty names."""
+    return [n for n in ((n or "").strip() for n in names or []) if n]
+
+
 def save_preferences(user_id: int, level: str | None, max_distance_km: float | None,
                      subjects: list[str], ccas: list[str], home_address: str | None):
-    """Save user preferences"""
+    """Save user preferences (one transaction: upsert + replace subjects/CCAs).
+    Returns the new preferences version."""
     db = get_db()
-    exists = db.execute("SELECT 1 FROM user_preferences WHERE user_id=?", (user_id,)).fetchone()
-    if exists:
-        db.execute("UPDATE user_preferences SET level=?, max_distance_km=?, home_address=? WHERE user_id=?",
-                   (level, max_distance_km, home_address, user_id)) 
-    else:
-        db.execute("INSERT INTO user_preferences(user_id, level, max_distance_km, home_address) VALUES(?,?,?,?)",
-                   (user_id, level, max_distance_km, home_address))  
-    
-    db.execute("DELETE FROM user_subjects WHERE user_id=?", (user_id,))
-    db.execute("DELETE FROM user_ccas WHERE user_id=?", (user_id,))
-    
-    for s in subjects or []:
-        s = (s or "").strip()
-        if s:
-            db.execute("INSERT OR IGNORE INTO user_subjects(user_id, subject_name) VALUES(?,?)", (user_id, s))
-    
-    for c in ccas or []:
-        c = (c or "").strip()
-        if c:
-            db.execute("INSERT OR IGNORE INTO user_ccas(user_id, cca_name) VALUES(?,?)", (user_id, c))
-    
-    db.commit()
+    subject_rows = [(user_id, s) for s in _clean_names(subjects)]
+    cca_rows = [(user_id, c) for c in _clean_names(ccas)]
+
+    # IMMEDIATE takes the write lock up front, so two concurrent saves queue
+    # on busy_timeout instead of failing when a read lock can't be upgraded
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        db.execute("""
+            INSERT INTO user_preferences(user_id, level, max_distance_km, home_address, pref_version)
+            VALUES(?,?,?,?,1)
+            ON CONFLICT(user_id) DO UPDATE SET
+                level = excluded.level,
+                max_distance_km = excluded.max_distance_km,
+                home_address = excluded.home_address,
+                pref_version = pref_version + 1
+        """, (user_id, level, max_distance_km, home_address))
+        version = db.execute("SELECT pref_version FROM user_preferences WHERE user_id=?", (user_id,)).fetchone()[0]
+
+        db.execute("DELETE FROM user_subjects WHERE user_id=?", (user_id,))
+        db.execute("DELETE FROM user_ccas WHERE user_id=?", (user_id,))
+        db.executemany("INSERT OR IGNORE INTO user_subjects(user_id, subject_name) VALUES(?,?)", subject_rows)
+        db.executemany("INSERT OR IGNORE INTO user_ccas(user_id, cca_name) VALUES(?,?)", cca_rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return version
+
+
+def bump_pref_version(user_id: int) -> int:
+    """Mark preferences as changed, inside the caller's transaction. Returns the new version."""
+    db = get_db()
+    db.execute(_BUMP_PREF_VERSION_SQL, (user_id,))
+    return db.execute("SELECT pref_version FROM user_preferences WHERE user_id=?", (user_id,)).fetchone()[0]
 
 
 def read_preferences(user_id: int) -> dict:
-    """Read user preferences"""
+    """Read user preferences (single query)"""
     db = get_db()
-    pref = db.execute("SELECT level, max_distance_km, home_address FROM user_preferences WHERE user_id=?", (user_id,)).fetchone()
-    level = pref["level"] if pref else None
-    max_distance_km = pref["max_distance_km"] if pref else None
-    home_address = pref["home_address"] if pref else None
-    
-    subjects = [r["subject_name"] for r in db.execute(
-        "SELECT subject_name FROM user_subjects WHERE user_id=?", (user_id,)
-    ).fetchall()]
-    
-    ccas = [r["cca_name"] for r in db.execute(
-        "SELECT cca_name FROM user_ccas WHERE user_id=?", (user_id,)
-    ).fetchall()]
-    
-    return {
-        "level": level,
-        "max_distance_km": max_distance_km,
-        "home_address": home_address,
-        "subjects": subjects,
-        "ccas": ccas
-    }
+    row = db.execute(_READ_PREFERENCES_SQL, (user_id,)).fetchone()
+    return _prefs_from_row(row)
+
+
+def user_preferences(user: User) -> dict:
+    """Preferences of a resolved user; only queried when user.pref_version isn't cached"""
+    key = (user.id, user.pref_version)
+    prefs = _prefs_cache.get(key)
+    if prefs is None:
+        prefs = read_preferences(user.id)
+        _prefs_cache.set(key, prefs)
+    return prefs
+
+
+def read_profile(user_id: int):
+    """(User, preferences) in one query, or None if the user doesn't exist"""
+    db = get_db()
+    row = db.execute(_READ_PROFILE_SQL, (user_id,)).fetchone()
+    if not row:
+        return None
+    return User(row["id"], row["name"], row["email"], row["pref_version"]), _prefs_from_row(row)
+
+
+# ---------------------
+# Favorites functions
+# ---------------------
+def list_favorites(user_id: int) -> list[str]:
+    """Saved school names, oldest first"""
+    db = get_db()
+    rows = db.execute("SELECT school_name FROM user_favorites WHERE user_id=? ORDER BY id", (user_id,)).fetchall()
+    return [r["school_name"] for r in rows]
+
+
+def add_favorite(user_id: int, school_name: str):
+    """Save a school (no-op if already saved)"""
+    db = get_db()
+    db.execute("INSERT OR IGNORE INTO user_favorites(user_id, school_name) VALUES(?,?)", (user_id, school_name))
+    db.commit()
+
+
+def remove_favorite(user_id: int, school_name: str):
+    """Unsave a school"""
+    db = get_db()
+    db.execute("DELETE FROM user_favorites WHERE user_id=? AND school_name=?", (user_id, school_name))
+    db.commit()
+
+
+def set_favorites(user_id: int, school_names: list[str]):
+    """Replace the saved list (one transaction; keeps the given order)"""
+    db = get_db()
+    rows = [(user_id, n) for n in _clean_names(school_names)]
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        db.execute("DELETE FROM user_favorites WHERE user_id=?", (user_id,))
+        db.executemany("INSERT OR IGNORE INTO user_favorites(user_id, school_name) VALUES(?,?)", rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
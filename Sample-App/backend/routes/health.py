@@ -1,8 +1,14 @@
 from flask import Blueprint
 import time
+from utils.cache import cache_stats
 
 health_bp = Blueprint("health", __name__)
 
 @health_bp.get("/health")
 def health():
     return {"ok": True, "time": time.time()}
+
+@health_bp.get("/health/cache")
+def health_cache():
+    """Per-namespace cache counters (entries, bytes, hits, misses, evictions)."""
+    return {"ok": True, "caches": cache_stats()}
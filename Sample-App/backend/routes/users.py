@@ -13,15 +13,24 @@ PWD_REGEX = re.compile(
 from utils.db import get_db
 from models.user_model import (
     current_user,
+    current_profile,
+    remember_user,
+    User,
     create_user_local,
     get_user_by_email,
     verify_password,
     save_preferences,
-    read_preferences,
+    user_preferences,
+    bump_pref_version,
     get_user_by_google_id,
     create_user_google,
-    get_user_by_id
+    get_user_by_id,
+    list_favorites,
+    add_favorite,
+    remove_favorite,
+    set_favorites
 )
+from services.data_fetcher import find_school, get_school_cards
 
 load_dotenv()
 
@@ -178,10 +187,10 @@ def email_exists():
 @user_bp.get("/me")
 def me():
     """Get current logged-in user (works for both Google and email/password users)"""
-    u = current_user()
-    if not u:
+    profile = current_profile()
+    if not profile:
         return {"user": None}
-    prefs = read_preferences(u.id)
+    u, prefs = profile
     return {"user": {"id": u.id, "name": u.name, "email": u.email}, "preferences": prefs}
 
 
@@ -194,7 +203,7 @@ def get_preferences():
     u = current_user()
     if not u:
         return {"error": "Not logged in"}, 401
-    return {"ok": True, **read_preferences(u.id)}
+    return {"ok": True, **user_preferences(u)}
 
 
 @user_bp.put("/preferences")
@@ -209,7 +218,8 @@ def put_preferences():
     subjects = data.get("subjects") or []
     ccas = data.get("ccas") or []
     home_address = data.get("home_address")
-    save_preferences(u.id, level, max_distance_km, subjects, ccas, home_address)
+    version = save_preferences(u.id, level, max_distance_km, subjects, ccas, home_address)
+    remember_user(User(u.id, u.name, u.email, version))
     return {"ok": True}
 
 
@@ -219,18 +229,16 @@ def put_preferences():
 @user_bp.get("/profile")
 def get_profile():
     """Get user profile"""
-    u = current_user()
-    if not u:
+    profile = current_profile()
+    if not profile:
         return {"error": "Not logged in"}, 401
+    u, prefs = profile
 
-    db = get_db()
-    subjects = db.execute("SELECT subject_name FROM user_subjects WHERE user_id=?", (u.id,)).fetchall()
-    
     return jsonify({
         "id": u.id,
         "name": u.name,
         "email": u.email,
-        "subjects": [s["subject_name"] for s in subjects]
+        "subjects": prefs["subjects"]
     })
 
 
@@ -288,7 +296,9 @@ def add_subject():
 
     db = get_db()
     db.execute("INSERT INTO user_subjects(user_id, subject_name) VALUES (?, ?)", (u.id, subject))
+    version = bump_pref_version(u.id)
     db.commit()
+    remember_user(User(u.id, u.name, u.email, version))
     return {"ok": True}
 
 
@@ -306,7 +316,88 @@ def delete_subject():
 
     db = get_db()
     db.execute("DELETE FROM user_subjects WHERE user_id=? AND subject_name=?", (u.id, subject))
+    version = bump_pref_version(u.id)
     db.commit()
+    remember_user(User(u.id, u.name, u.email, version))
+    return {"ok": True}
+
+# ==========================================
+# FAVORITES (SAVED SCHOOLS) ROUTES
+# ==========================================
+# Every response carries the whole saved list as school cards (directory
+# fields + cut-offs from memory), so the Saved tab is one request.
+def _favorites_response(user_id, **extra):
+    return {"ok": True, "items": get_school_cards(list_favorites(user_id)), **extra}
+
+
+@user_bp.get("/favorites")
+def get_favorites():
+    """List saved schools"""
+    u = current_user()
+    if not u:
+        return {"error": "Not logged in"}, 401
+    return _favorites_response(u.id)
+
+
+@user_bp.post("/favorites")
+def post_favorite():
+    """Save a school"""
+    u = current_user()
+    if not u:
+        return {"error": "Not logged in"}, 401
+
+    data = request.get_json(force=True) or {}
+    name = (data.get("school_name") or "").strip()
+    if not name:
+        return {"error": "school_name required"}, 400
+    school = find_school(name)
+    if not school:
+        return {"error": "not found"}, 404
+
+    add_favorite(u.id, school.school_name)
+    return _favorites_response(u.id)
+
+
+@user_bp.delete("/favorites")
+def delete_favorite():
+    """Unsave a school (school_name in the JSON body or query string)"""
+    u = current_user()
+    if not u:
+        return {"error": "Not logged in"}, 401
+
+    data = request.get_json(silent=True) or {}
+    name = (data.get("school_name") or request.args.get("school_name") or "").strip()
+    if not name:
+        return {"error": "school_name required"}, 400
+    school = find_school(name)
+
+    remove_favorite(u.id, school.school_name if school else name)
+    return _favorites_response(u.id)
+
+
+@user_bp.put("/favorites")
+def put_favorites():
+    """Replace the saved list; names not in the directory are returned as `ignored`"""
+    u = current_user()
+    if not u:
+        return {"error": "Not logged in"}, 401
+
+    data = request.get_json(force=True) or {}
+    names = data.get("school_names")
+    if not isinstance(names, list):
+        return {"error": "school_names must be a list"}, 400
+
+    known, ignored = [], []
+    for n in names:
+        school = find_school(n) if isinstance(n, str) else None
+        if school:
+            known.append(school.school_name)
+        else:
+            ignored.append(n)
+
+    set_favorites(u.id, known)
+    return _favorites_response(u.id, ignored=ignored)
+
 
 # ==========================================
 # RESET PASSWORD SIMPLE
@@ -1,96 +1,273 @@
-import requests
 import time
+import hashlib
+import json
 import pandas as pd
 import os
 import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from services.school_record import SchoolRecord
+from services.search_index import SearchIndex
+from services.vocab import Vocabulary
+from utils.cache import get_cache
+from utils.http import session
+from utils.singleflight import SingleFlight
+from utils.snapshot import OFFLINE, load_fixture, load_snapshot, rows_version, save_snapshot
 
 # ------------------------------------------------------------------
 # Hardcoded dataset IDs from the School Directory & Information collection (ID 457)
 # ------------------------------------------------------------------
+DATA_GOV_API = os.environ.get("DATA_GOV_API", "https://api-production.data.gov.sg/v2/public/api")
+
 DATASETS = {
     "ccas": "d_9aba12b5527843afb0b2e8e4ed6ac6bd",        # CCAs
     "subjects": "d_f1d144e423570c9d84dbc5102c2e664d",    # Subjects Offered
     "school_info": "d_688b934f82c1059ed0a6993d2a829089"  # School general info
 }
+_DATASET_NAMES = {dataset_id: name for name, dataset_id in DATASETS.items()}
+
+_PAGE_SIZE = 5000
+_PAGE_WORKERS = 4   # concurrent page requests per dataset
+
+# ------------------------------------------------------------------
+# Dataset freshness (stale-while-revalidate)
+# ------------------------------------------------------------------
+# Younger than DATASET_TTL_SEC: served as is.
+# Up to DATASET_MAX_STALE_SEC: served as is while a background refresh runs.
+# Older: the caller waits for a refetch. If the upstream fails at any point
+# the last good snapshot keeps being served, retried after DATASET_RETRY_SEC.
+DATASET_TTL_SEC = float(os.environ.get("DATASET_TTL_SEC", 600))
+DATASET_MAX_STALE_SEC = float(os.environ.get("DATASET_MAX_STALE_SEC", 24 * 3600))
+DATASET_RETRY_SEC = float(os.environ.get("DATASET_RETRY_SEC", 60))
 
 # ------------------------------------------------------------------
 # Caches
 # ------------------------------------------------------------------
-_cache = {"items": None, "timestamp": 0, "ttl": 600}  # cache for school list (10 min)
-_detail_cache = {}  # cache per school details
-_dataset_cache = {}  # cache for raw datasets
+_schools_cache = get_cache("schools", max_entries=1)             # school list + lookup maps, replaced when school_info changes
+_dataset_cache = get_cache("datasets", max_entries=8, max_bytes=256 * 1024 * 1024)  # raw datasets; freshness checked by _fetch_dataset
+_index_cache = get_cache("indexes", max_entries=1)  # per-school CCAs + subjects + vocabularies, replaced when the datasets change
+_options_cache = get_cache("options", max_entries=1)  # /api/schools/options payload for the current directory + index
+
+_EMPTY_DIRECTORY = {"items": [], "by_name": {}, "search": SearchIndex([]), "cutoffs": {}, "facets": {}}
+EMPTY_OFFERINGS = {
+    "by_name": {},
+    "cca_vocab": Vocabulary([]), "subject_vocab": Vocabulary([]),
+    "cca_counts": [], "subject_counts": [],
+}
+
+# concurrent cache misses for the same dataset share one upstream download
+_flights = SingleFlight()
+_failed_at: dict[str, float] = {}   # dataset id -> time of the last failed refresh
 
 # ------------------------------------------------------------------
 # Load local cut-off point dataset (Excel)
 # ------------------------------------------------------------------
+COP_COLUMNS = [
+    "POSTING GROUP 3 (EXPRESS)",
+    "POSTING GROUP 3 AFFILIATED",
+    "POSTING GROUP 2 (NORMAL ACAD)",
+    "POSTING GROUP 2 AFFILIATED",
+    "POSTING GROUP 1 (NORMAL TECH)",
+    "POSTING GROUP 1 AFFILIATED",
+]
+
+def _parse_cop_cell(val):
+    """Return (display string, float or None) for one cut-off cell."""
+    if pd.isna(val):
+        return "N/A", None
+    if isinstance(val, (int, float, np.integer, np.floating)):
+        num = float(val)
+        # If value is a float but represents a whole number (like 14.0), cast to int
+        display = str(int(val)) if num.is_integer() else str(round(val, 2))
+        return display, num
+    display = str(val).strip()
+    try:
+        return display, float(display)
+    except ValueError:
+        return display, None
+
+def _load_cop(path: str) -> dict:
+    """
+    Parse school_cop.xlsx once into
+    {lower-case school name: {"display": {col: "14"}, "numeric": {col: 14.0}}}.
+    """
+    table = {}
+    for row in pd.read_excel(path).to_dict("records"):
+        name = row.get("school_name")
+        if not isinstance(name, str) or name.strip().lower() in table:
+            continue
+        display, numeric = {}, {}
+        for col in COP_COLUMNS:
+            display[col], numeric[col] = _parse_cop_cell(row.get(col, "N/A"))
+        table[name.strip().lower()] = {"display": display, "numeric": numeric}
+    return table
+
 try:
     cop_path = os.path.join(os.path.dirname(__file__), "..", "school_cop.xlsx")
     cop_path = os.path.abspath(cop_path)
-    cop_df = pd.read_excel(cop_path)
-    cop_df["school_name"] = cop_df["school_name"].str.strip().str.lower()
-    print(f"📘 Loaded {len(cop_df)} rows from school_cop.xlsx")
+    _cop = _load_cop(cop_path)
+    with open(cop_path, "rb") as f:
+        COP_VERSION = rows_version(f.read())
+    print(f"📘 Loaded {len(_cop)} schools from school_cop.xlsx")
 except Exception as e:
     print(f"⚠️ Could not load school_cop.xlsx: {e}")
-    cop_df = pd.DataFrame()
+    _cop = {}
+    COP_VERSION = "none"
 
 # ------------------------------------------------------------------
 # Fetch dataset from Data.gov.sg (cached)
 # ------------------------------------------------------------------
 def _fetch_dataset(dataset_id: str):
-    """Fetch all rows from a Data.gov.sg dataset, with pagination support."""
-    if dataset_id in _dataset_cache and time.time() - _dataset_cache[dataset_id]["timestamp"] < 600:
-        return _dataset_cache[dataset_id]["data"]
-
-    all_rows = []
-    limit = 5000
-    offset = 0
-
-    while True:
-        url = f"https://api-production.data.gov.sg/v2/public/api/datasets/{dataset_id}/list-rows?limit={limit}&offset={offset}"
-        resp = requests.get(url, timeout=25)
-        resp.raise_for_status()
-        data = resp.json()
-
-        rows = (
-            data.get("data", {}).get("rows")
-            or data.get("data", {}).get("items")
-            or data.get("data", [])
-        ) or []
-
-        if not rows:
-            break
-
-        all_rows.extend(rows)
-
-        print(f"✅ Retrieved {len(rows)} rows (offset={offset}) from dataset {dataset_id}")
+    """
+    Rows of a Data.gov.sg dataset. Stale snapshots are served immediately
+    while they refresh in the background (see DATASET_* above).
+    In offline mode only the on-disk snapshot or fixture is used.
+    """
+    cached = _dataset_cache.get(dataset_id) or _restore_dataset(dataset_id)
+    if OFFLINE:
+        if not cached:
+            raise RuntimeError(f"offline mode: no snapshot or fixture for dataset {dataset_id}")
+        return cached["data"]
+
+    key = ("dataset", dataset_id)
+    if cached:
+        age = time.time() - cached["timestamp"]
+        if age < DATASET_TTL_SEC:
+            return cached["data"]
+        if time.time() - _failed_at.get(dataset_id, 0) < DATASET_RETRY_SEC:
+            return cached["data"]  # upstream just failed; don't hammer it
+        if age < DATASET_MAX_STALE_SEC:
+            _flights.start(key, lambda: _refresh_dataset(dataset_id))
+            return cached["data"]
 
-        if len(rows) < limit:
-            break  # No more pages
-        offset += limit
+    try:
+        return _flights.do(key, lambda: _refresh_dataset(dataset_id))
+    except Exception as e:
+        if not cached:
+            raise
+        print(f"⚠️ Refresh of {dataset_id} failed ({e}); serving snapshot from {time.time() - cached['timestamp']:.0f}s ago")
+        return cached["data"]
+
+def _refresh_dataset(dataset_id: str, force: bool = False):
+    # another caller may have finished the download while we were queueing
+    cached = _dataset_cache.get(dataset_id)
+    if cached and not force and time.time() - cached["timestamp"] < DATASET_TTL_SEC:
+        return cached["data"]
+    try:
+        rows = _download_dataset(dataset_id)
+    except Exception:
+        _failed_at[dataset_id] = time.time()
+        raise
+    _failed_at.pop(dataset_id, None)
+    fetched_at = time.time()
+    try:
+        version = save_snapshot(dataset_id, rows, fetched_at)
+    except Exception as e:
+        print(f"⚠️ Could not write snapshot for {dataset_id}: {e}")
+        version = rows_version(json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode())
+    # unchanged content keeps the old rows object: derived caches (directory,
+    # indexes, options, engine) check it by identity and stay valid
+    previous = _dataset_cache.get(dataset_id)
+    if previous and previous["version"] == version:
+        rows = previous["data"]
+    _dataset_cache.set(dataset_id, {"data": rows, "timestamp": fetched_at, "version": version})
+    return rows
+
+def data_version(*names: str, cop: bool = False) -> str:
+    """
+    Short hash of the loaded versions of the named datasets (plus
+    school_cop.xlsx if cop=True); changes whenever their content does.
+    Goes through _fetch_dataset, so stale data still refreshes as usual.
+    """
+    parts = [COP_VERSION] if cop else []
+    for name in names:
+        dataset_id = DATASETS[name]
+        try:
+            _fetch_dataset(dataset_id)
+        except Exception:
+            pass   # the endpoint itself reports the failure
+        entry = _dataset_cache.get(dataset_id)
+        parts.append(f"{name}:{entry['version'] if entry else '-'}")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+def _restore_dataset(dataset_id: str):
+    """Put the on-disk snapshot (or, offline, the fixture) into the cache. No network."""
+    def load():
+        cached = _dataset_cache.get(dataset_id)
+        if cached:
+            return cached
+        snap = load_snapshot(dataset_id)
+        if snap is None and OFFLINE:
+            snap = load_fixture(_DATASET_NAMES.get(dataset_id, dataset_id))
+        if snap is not None:
+            _dataset_cache.set(dataset_id, snap)
+            print(f"💾 Loaded {len(snap['data'])} rows of {dataset_id} from disk (version {snap['version']})")
+        return snap
+    return _flights.do(("restore", dataset_id), load)
+
+def _fetch_page(dataset_id: str, offset: int):
+    """One page of rows plus the dataset's total row count (None if not reported)."""
+    url = f"{DATA_GOV_API}/datasets/{dataset_id}/list-rows?limit={_PAGE_SIZE}&offset={offset}"
+    resp = session.get(url, timeout=25)
+    resp.raise_for_status()
+    data = resp.json()
+
+    rows = (
+        data.get("data", {}).get("rows")
+        or data.get("data", {}).get("items")
+        or data.get("data", [])
+    ) or []
+    total = data.get("data", {}).get("total") if isinstance(data.get("data"), dict) else None
+    print(f"✅ Retrieved {len(rows)} rows (offset={offset}) from dataset {dataset_id}")
+    return rows, total if isinstance(total, int) else None
+
+def _download_dataset(dataset_id: str):
+    """Fetch all rows from a Data.gov.sg dataset, with pagination support."""
+    rows, total = _fetch_page(dataset_id, 0)
+    all_rows = list(rows)
+
+    if total is not None and len(rows) == _PAGE_SIZE:
+        # total known: request the remaining pages concurrently (order kept by map)
+        offsets = range(_PAGE_SIZE, total, _PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=min(_PAGE_WORKERS, len(offsets) or 1)) as pool:
+            for page in pool.map(lambda offset: _fetch_page(dataset_id, offset)[0], offsets):
+                all_rows.extend(page)
+    else:
+        # no total: walk the pages until a short one
+        offset = 0
+        while len(rows) == _PAGE_SIZE:
+            offset += _PAGE_SIZE
+            rows, _ = _fetch_page(dataset_id, offset)
+            all_rows.extend(rows)
 
     print(f"📦 Total rows fetched from {dataset_id}: {len(all_rows)}")
-    _dataset_cache[dataset_id] = {"data": all_rows, "timestamp": time.time()}
     return all_rows
 
+def _fetch_datasets(*dataset_ids):
+    """
+    _fetch_dataset for several datasets. Cache hits are served inline (this
+    is on every request's path); only datasets that need a blocking
+    download are fetched in parallel.
+    """
+    now = time.time()
+    missing = [
+        d for d in dataset_ids
+        if not (c := _dataset_cache.get(d)) or now - c["timestamp"] >= DATASET_MAX_STALE_SEC
+    ]
+    if len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            list(pool.map(_fetch_dataset, missing))
+    return [_fetch_dataset(d) for d in dataset_ids]
+
+def _school_key(name) -> str:
+    return (name or "").strip().upper()
+
 # ------------------------------------------------------------------
 # Normalize school info dataset
 # ------------------------------------------------------------------
-def _normalize_school_data(rows):
-    normalized = []
-    for s in rows:
-        normalized.append({
-            "school_name": (s.get("school_name") or "").strip(),
-            "postal_code": s.get("postal_code") or "",
-            "mainlevel_code": s.get("mainlevel_code") or "",
-            "zone_code": s.get("zone_code") or "",
-            "type_code": s.get("type_code") or "",
-            "address": s.get("address") or "",
-            "telephone_no": s.get("telephone_no") or "",
-            "email_address": s.get("email_address") or "",
-            "url_address": s.get("url_address") or s.get("website") or "",
-            **s,
-        })
-    return normalized
+def _normalize_school_data(rows) -> list[SchoolRecord]:
+    return [SchoolRecord.from_row(s) for s in rows]
 
 # ------------------------------------------------------------------
 # Cut-off point lookup helper
@@ -100,118 +277,312 @@ def get_cutoff_for_school(school_name: str):
     Return cut-off point data for a given school.
     If the school isn't found or has empty cells, return 'N/A' for all.
     """
-    default = {
-        "POSTING GROUP 3 (EXPRESS)": "N/A",
-        "POSTING GROUP 3 AFFILIATED": "N/A",
-        "POSTING GROUP 2 (NORMAL ACAD)": "N/A",
-        "POSTING GROUP 2 AFFILIATED": "N/A",
-        "POSTING GROUP 1 (NORMAL TECH)": "N/A",
-        "POSTING GROUP 1 AFFILIATED": "N/A",
-    }
+    entry = _cop.get((school_name or "").strip().lower())
+    if not entry:
+        return {col: "N/A" for col in COP_COLUMNS}
+    return dict(entry["display"])
+
+def get_cutoff_numeric(school_name: str):
+    """Same columns as get_cutoff_for_school, as floats (None when blank or non-numeric)."""
+    entry = _cop.get((school_name or "").strip().lower())
+    if not entry:
+        return {col: None for col in COP_COLUMNS}
+    return dict(entry["numeric"])
+
+def _is_na(v):
+    if not v:
+        return True
+    s = str(v).strip().upper()
+    return s in {"N/A", "NA", "-", ""}
+
+def summarize_cutoff(cutoff_points: dict | None) -> str | None:
+    """Pick one representative cutoff for cards."""
+    if not cutoff_points:
+        return None
+    order = [
+        "POSTING GROUP 3 (EXPRESS)",
+        "POSTING GROUP 3 AFFILIATED",
+        "POSTING GROUP 2 (NORMAL ACAD)",
+        "POSTING GROUP 1 (NORMAL TECH)",
+    ]
+    for k in order:
+        v = cutoff_points.get(k)
+        if not _is_na(v):
+            return str(v)
+    return None
+
+def _build_cutoff_index(schools):
+    """Full cut-off map + card summary for every school, keyed by upper-case name."""
+    index = {}
+    for s in schools:
+        points = get_cutoff_for_school(s["school_name"])
+        index.setdefault(_school_key(s["school_name"]), {
+            "cutoff_points": points,
+            "cutoff_numeric": get_cutoff_numeric(s["school_name"]),
+            "cutoff_primary": summarize_cutoff(points),
+        })
+    return index
+
+def get_cutoff_summary(school_name: str) -> dict:
+    """{"cutoff_points", "cutoff_numeric", "cutoff_primary"} for a school, without touching details."""
+    directory = _schools_cache.get("directory") or _EMPTY_DIRECTORY
+    entry = directory["cutoffs"].get(_school_key(school_name))
+    if entry is None:
+        points = get_cutoff_for_school(school_name)
+        entry = {
+            "cutoff_points": points,
+            "cutoff_numeric": get_cutoff_numeric(school_name),
+            "cutoff_primary": summarize_cutoff(points),
+        }
+    return entry
+
+# ------------------------------------------------------------------
+# Main school list (for /api/schools)
+# ------------------------------------------------------------------
+def get_schools(fetch_all=False):
+    """
+    Fetch general school info. Rebuilt whenever the school_info snapshot
+    changes; [] only if there has never been a successful fetch.
+    """
+    try:
+        rows = _fetch_dataset(DATASETS["school_info"])
+    except Exception as e:
+        print("❌ [data_fetcher] Failed to fetch school data:", e)
+        return []
 
-    if cop_df.empty or not school_name:
-        return default
+    directory = _schools_cache.get("directory")
+    if directory and directory["rows"] is rows:
+        return directory["items"]
+    return _flights.do("directory", lambda: _build_directory(rows))["items"]
+
+def _build_directory(rows):
+    directory = _schools_cache.get("directory")
+    if directory and directory["rows"] is rows:
+        return directory
+
+    data = _normalize_school_data(rows)
+    by_name = {}
+    levels, zones, types = Counter(), Counter(), Counter()
+    for s in data:
+        by_name.setdefault(_school_key(s["school_name"]), s)
+        for counter, value in ((levels, s.mainlevel_code), (zones, s.zone_code), (types, s.type_code)):
+            if value:
+                counter[value.upper()] += 1
+    directory = {
+        "rows": rows,
+        "items": data,
+        "by_name": by_name,
+        "search": SearchIndex(data),
+        "cutoffs": _build_cutoff_index(data),
+        "facets": {"levels": levels, "zones": zones, "types": types},   # schools per option value
+    }
+    _schools_cache.set("directory", directory)
+    print(f"✅ Cached {len(data)} school records")
+    return directory
+
+def refresh_datasets() -> dict:
+    """Refetch every dataset now, rewriting its snapshot. Returns {name: row count}."""
+    return {
+        name: len(_flights.do(("dataset", dataset_id), lambda dataset_id=dataset_id: _refresh_dataset(dataset_id, force=True)))
+        for name, dataset_id in DATASETS.items()
+    }
 
-    name = school_name.strip().lower()
-    match = cop_df[cop_df["school_name"] == name]
-    if match.empty:
-        return default
+def warm_start() -> None:
+    """
+    Load whatever snapshots are on disk and build the school list from them.
+    Datasets without a snapshot are downloaded in parallel in the background;
+    requests arriving meanwhile join those downloads. Stale data refreshes on first use.
+    """
+    t0 = time.perf_counter()
+    missing = [dataset_id for dataset_id in DATASETS.values() if not _restore_dataset(dataset_id)]
+    info = _dataset_cache.get(DATASETS["school_info"])
+    if info:
+        _flights.do("directory", lambda: _build_directory(info["data"]))
+        print(f"💾 Warm start from snapshots in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    if missing and not OFFLINE:
+        _flights.start("warm-up", _warm_up)
+
+def _warm_up():
+    t0 = time.perf_counter()
+    _fetch_datasets(*DATASETS.values())
+    get_schools()
+    get_school_index()
+    print(f"🔥 Datasets downloaded and indexed in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+def _directory() -> dict:
+    """The cached school list with its lookup maps, loading it if needed."""
+    get_schools()
+    return _schools_cache.get("directory") or _EMPTY_DIRECTORY
+
+def get_search_index() -> SearchIndex:
+    """Filter index over the current school list (built together with it)."""
+    return _directory()["search"]
 
-    row = match.iloc[0]
-    result = {}
-    for col in default.keys():
-        val = row.get(col, "N/A")
+# ------------------------------------------------------------------
+# Per-school CCA / subject index (built once per dataset load)
+# ------------------------------------------------------------------
+def _build_school_index(ccas, subjects):
+    """
+    Group the raw CCA and subject rows by school name in a single pass, then
+    give every distinct CCA / subject an id and each school a bitset of them.
+    """
+    grouped = {}
+    for c in ccas:
+        key = _school_key(c.get("School_name") or c.get("school_name"))
+        cca = (c.get("cca_grouping_desc") or c.get("Cca_grouping_desc") or "").strip()
+        if key and cca:
+            grouped.setdefault(key, (set(), set()))[0].add(cca)
+    for s in subjects:
+        key = _school_key(s.get("School_Name") or s.get("school_name"))
+        subj = (s.get("Subject_Desc") or s.get("subject_desc") or "").strip()
+        if key and subj:
+            grouped.setdefault(key, (set(), set()))[1].add(subj)
+
+    cca_vocab = Vocabulary(t for cca_set, _ in grouped.values() for t in cca_set)
+    subject_vocab = Vocabulary(t for _, subj_set in grouped.values() for t in subj_set)
+    by_name = {
+        key: {
+            "ccas": sorted(cca_set),
+            "subjects": sorted(subj_set),
+            "cca_bits": cca_vocab.bits(cca_set),
+            "subject_bits": subject_vocab.bits(subj_set),
+        }
+        for key, (cca_set, subj_set) in grouped.items()
+    }
+    return {
+        "by_name": by_name,
+        "cca_vocab": cca_vocab,
+        "subject_vocab": subject_vocab,
+        # schools offering each term, indexed by vocabulary id
+        "cca_counts": cca_vocab.counts(e["cca_bits"] for e in by_name.values()),
+        "subject_counts": subject_vocab.counts(e["subject_bits"] for e in by_name.values()),
+    }
 
-        if pd.isna(val):
-            result[col] = "N/A"
-        elif isinstance(val, (int, float, np.integer, np.floating)):
-            # If value is a float but represents a whole number (like 14.0), cast to int
-            if float(val).is_integer():
-                result[col] = str(int(val))
-            else:
-                # keep as-is if it has real decimal part (just in case)
-                result[col] = str(round(val, 2))
-        else:
-            result[col] = str(val).strip()
+def get_offerings() -> dict:
+    """
+    {"by_name": {UPPER SCHOOL NAME: {"ccas", "subjects", "cca_bits", "subject_bits"}},
+     "cca_vocab": Vocabulary, "subject_vocab": Vocabulary,
+     "cca_counts": [schools per id], "subject_counts": [...]}.
+    Rebuilt whenever the raw datasets are refetched; the new index is
+    swapped in as a whole so readers never see a half-built one (or bits
+    from one build with the vocabulary of another).
+    """
+    ccas, subjects = _fetch_datasets(DATASETS["ccas"], DATASETS["subjects"])
+    cached = _index_cache.get("schools")
+    if cached and cached["cca_rows"] is ccas and cached["subject_rows"] is subjects:
+        return cached
 
+    offerings = {**_build_school_index(ccas, subjects), "cca_rows": ccas, "subject_rows": subjects}
+    _index_cache.set("schools", offerings)
+    print(f"🗂️ Indexed {len(offerings['cca_vocab'])} CCAs / {len(offerings['subject_vocab'])} subjects "
+          f"for {len(offerings['by_name'])} schools")
+    return offerings
 
-    return result
+def get_school_index():
+    """Return {UPPER SCHOOL NAME: {"ccas": [...], "subjects": [...], ...}}."""
+    return get_offerings()["by_name"]
 
 # ------------------------------------------------------------------
-# Main school list (for /api/schools)
+# Filter / preference options (for /api/schools/options)
 # ------------------------------------------------------------------
-def get_schools(fetch_all=False):
-    """Fetch general school info (cached for 10 min)."""
-    if _cache["items"] and time.time() - _cache["timestamp"] < _cache["ttl"]:
-        print("🔁 Returning cached school data")
-        return _cache["items"]
-
+def get_options() -> dict:
+    """
+    Every level, zone, type, subject and CCA with its school count, plus a
+    version hash of the whole payload. Assembled from counts taken when the
+    datasets were indexed and kept until the directory or index changes.
+    """
+    directory = _directory()
     try:
-        print(f"Fetching dataset 'school_info' ({DATASETS['school_info']}) ...")
-        rows = _fetch_dataset(DATASETS["school_info"])
-        data = _normalize_school_data(rows)
-
-        _cache["items"] = data
-        _cache["timestamp"] = time.time()
-        print(f"✅ Cached {len(data)} school records")
-        return data
+        offerings = get_offerings()
     except Exception as e:
-        print("❌ [data_fetcher] Failed to fetch school data:", e)
-        return []
+        print(f"⚠️ Could not load CCA/subject index: {e}")
+        offerings = EMPTY_OFFERINGS
+
+    cached = _options_cache.get("current")
+    if cached and cached["directory"] is directory and cached["offerings"] is offerings:
+        return cached["payload"]
+
+    facets = directory["facets"]
+    counts = {name: dict(sorted(facets.get(name, {}).items())) for name in ("levels", "zones", "types")}
+    counts["subjects"] = dict(zip(offerings["subject_vocab"].terms, offerings["subject_counts"]))
+    counts["ccas"] = dict(zip(offerings["cca_vocab"].terms, offerings["cca_counts"]))
+
+    payload = {name: list(values) for name, values in counts.items()}
+    payload["counts"] = counts
+    payload["version"] = hashlib.sha1(json.dumps(counts, sort_keys=True).encode()).hexdigest()[:12]
+    _options_cache.set("current", {"directory": directory, "offerings": offerings, "payload": payload})
+    return payload
+
+# ------------------------------------------------------------------
+# School cards (saved schools): directory + cut-offs, no detail enrichment
+# ------------------------------------------------------------------
+def find_school(school_name: str) -> SchoolRecord | None:
+    """The directory record for a name (case-insensitive), or None."""
+    return _directory()["by_name"].get(_school_key(school_name))
+
+def get_school_cards(names) -> list[dict]:
+    """
+    Card data for each name, in the given order, straight from the in-memory
+    directory and cut-off index. Names no longer in the directory still get a
+    card (blank fields) so they can be shown and removed.
+    """
+    by_name = _directory()["by_name"]
+    cards = []
+    for name in names:
+        school = by_name.get(_school_key(name)) or SchoolRecord(school_name=name)
+        cutoff = get_cutoff_summary(school.school_name)
+        card = school.to_dict()
+        card["cutoff_primary"] = cutoff["cutoff_primary"]
+        card["cutoff_points"] = dict(cutoff["cutoff_points"])
+        cards.append(card)
+    return cards
 
 # ------------------------------------------------------------------
 # Detailed info for one school (info + CCAs + subjects + cut-off)
 # ------------------------------------------------------------------
+def _details(school: SchoolRecord, offerings: dict) -> dict:
+    """A fresh details dict for one record; nothing shared is modified."""
+    details = school.to_dict()
+    entry = offerings.get(_school_key(school.school_name)) or {}
+    details["ccas"] = list(entry.get("ccas", []))
+    details["subjects"] = list(entry.get("subjects", []))
+    details["cutoff_points"] = dict(get_cutoff_summary(school.school_name)["cutoff_points"])
+    return details
+
+def _offerings_or_empty(school_name: str = "") -> dict:
+    try:
+        return get_school_index()
+    except Exception as e:
+        print(f"⚠️ Could not enrich details for '{school_name}': {e}")
+        return {}
+
 def get_school_details(school_name: str):
     """
     Get detailed info for one school:
     - From main dataset (school_info)
     - Enriched with CCAs, subjects, and cut-off points
+    Built fresh from the record and the indexes; nothing shared is modified.
     """
-    key = school_name.strip().upper()
-
-    # 🔁 Return cached version if available
-    if key in _detail_cache and time.time() - _detail_cache[key]["timestamp"] < 600:
-        print(f"🔁 Returning cached details for '{school_name}'")
-        return _detail_cache[key]["data"]
-
-    # 1️⃣ Get main school info
-    schools = _cache["items"] or _normalize_school_data(_fetch_dataset(DATASETS["school_info"]))
-    school = next((s for s in schools if (s.get("school_name") or "").strip().upper() == key), None)
+    school = _directory()["by_name"].get(_school_key(school_name))
     if not school:
         print(f"⚠️ School '{school_name}' not found in main dataset.")
         return None
+    return _details(school, _offerings_or_empty(school_name))
 
-    # 2️⃣ Load and enrich with CCAs + subjects
-    try:
-        ccas = _fetch_dataset(DATASETS["ccas"])
-        subjects = _fetch_dataset(DATASETS["subjects"])
-
-        # Normalize case differences and match by uppercase name
-        cca_list = sorted({
-            (c.get("cca_grouping_desc") or c.get("Cca_grouping_desc") or "").strip()
-            for c in ccas
-            if (c.get("School_name") or c.get("school_name") or "").strip().upper() == key
-        } - {""})
-
-        subj_list = sorted({
-            (s.get("Subject_Desc") or s.get("subject_desc") or "").strip()
-            for s in subjects
-            if (s.get("School_Name") or s.get("school_name") or "").strip().upper() == key
-        } - {""})
-
-        school["ccas"] = cca_list
-        school["subjects"] = subj_list
-
-        print(f"✅ Enriched {school_name} with {len(cca_list)} CCAs and {len(subj_list)} subjects.")
-    except Exception as e:
-        print(f"⚠️ Could not enrich details for '{school_name}': {e}")
-        school["ccas"] = []
-        school["subjects"] = []
-
-    # 3️⃣ Add cut-off point data
-    school["cutoff_points"] = get_cutoff_for_school(school_name)
-
-    # 4️⃣ Cache and return
-    _detail_cache[key] = {"data": school, "timestamp": time.time()}
-    return school
+def get_school_details_batch(names) -> dict:
+    """
+    {name: details or None} for many schools in one pass: the directory and
+    the CCA/subject index are looked up once, not once per name.
+    """
+    by_name = _directory()["by_name"]
+    offerings = None
+    out = {}
+    for name in names:
+        school = by_name.get(_school_key(name))
+        if school is None:
+            out[name] = None
+            continue
+        if offerings is None:
+            offerings = _offerings_or_empty(name)
+        out[name] = _details(school, offerings)
+    return out
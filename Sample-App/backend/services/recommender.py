@@ -0,0 +1,176 @@
+# services/recommender.py
+import numpy as np
+
+from services.spatial import GridIndex, haversine_km
+from services.vocab import Vocabulary, popcount_rows
+
+# ------------------------------------------------------------------
+# Column-oriented scoring engine for /api/schools/recommend
+# ------------------------------------------------------------------
+
+
+class RecommendationEngine:
+    """
+    Keeps the school directory as precomputed arrays so one preference set
+    can be scored against every school with a handful of NumPy operations:
+    - CCA / subject bitsets (uint64 words over the ingest vocabularies)
+    - integer level codes (normalized mainlevel_code)
+    - lat / lon columns (NaN when a school is not geocoded) and a grid
+      index over them for radius / nearest-neighbour queries
+    The engine is shared by request threads, so coordinates are never
+    written in place: load_coords builds new columns plus their grid and
+    swaps them in as one GridIndex, and each reader takes one snapshot.
+    """
+
+    def __init__(self, names, postal_codes, levels, cca_bits, subject_bits,
+                 cca_vocab: Vocabulary, subject_vocab: Vocabulary, cutoff_primary):
+        self.names = list(names)
+        self.sort_names = [n.lower() for n in self.names]
+        self.postal_codes = list(postal_codes)
+        self.cutoff_primary = list(cutoff_primary)
+        self.size = len(self.names)
+
+        self.cca_vocab, self.subj_vocab = cca_vocab, subject_vocab
+        self.cca_bits, self.subj_bits = list(cca_bits), list(subject_bits)
+        self.cca_matrix = cca_vocab.matrix(self.cca_bits)
+        self.subj_matrix = subject_vocab.matrix(self.subj_bits)
+
+        self.level_vocab: dict[str, int] = {}
+        self.level_codes = np.array(
+            [self.level_vocab.setdefault(lv, len(self.level_vocab)) if lv else -1 for lv in levels],
+            dtype=np.int32,
+        )
+
+        self.spatial = GridIndex(np.full(self.size, np.nan), np.full(self.size, np.nan))
+        self.coords_loaded = False
+
+    # ---------------------
+    # Coordinates
+    # ---------------------
+    @property
+    def lat(self) -> np.ndarray:
+        return self.spatial.lat
+
+    @property
+    def lon(self) -> np.ndarray:
+        return self.spatial.lon
+
+    def load_coords(self, coords: dict) -> int:
+        """
+        Fill the lat/lon columns from {postal: (lat, lon)}.
+        Returns how many schools are still missing; coords_loaded only
+        becomes True once every school has an answer (found or not found).
+        """
+        current = self.spatial
+        lats, lons = current.lat.copy(), current.lon.copy()
+        missing = 0
+        for i, postal in enumerate(self.postal_codes):
+            rec = coords.get((postal or "").strip())
+            if rec is None:
+                missing += 1
+                continue
+            lat, lon = rec
+            if lat and lon:
+                lats[i], lons[i] = lat, lon
+        self.spatial = GridIndex(lats, lons)
+        self.coords_loaded = missing == 0
+        return missing
+
+    def candidates_within(self, user_lat: float, user_lon: float, max_km: float) -> np.ndarray:
+        """
+        Ids of schools that can still earn a distance score: everything inside
+        max_km plus schools we could not geocode (they are never dropped).
+        """
+        geo = self.spatial
+        unknown = np.flatnonzero(np.isnan(geo.lat) | np.isnan(geo.lon))
+        return np.union1d(geo.within(user_lat, user_lon, max_km), unknown)
+
+    # ---------------------
+    # Scoring
+    # ---------------------
+    def _match_ratio(self, vocab: Vocabulary, matrix: np.ndarray, prefs: set[str], ids: np.ndarray) -> np.ndarray:
+        """Share of prefs each school in ids offers: popcount(bits & prefs mask) / len(prefs)."""
+        if not prefs:
+            return np.zeros(len(ids))
+        mask = vocab.to_words(vocab.bits(prefs))
+        used = np.flatnonzero(mask)
+        # only the words holding preference bits; cheaper over all rows than gathering ids first
+        hits = popcount_rows(matrix[:, used] & mask[used])
+        return (hits if len(ids) == self.size else hits[ids]) / len(prefs)
+
+    def score(self, prefs: dict, weights: dict, level: str | None, user_lat=None, user_lon=None, ids=None) -> dict:
+        """
+        Score schools against one preference set.
+        `level` must already be normalized the same way as the school levels.
+        `ids` restricts scoring to those school rows (default: all schools).
+        Returns the per-factor columns, aligned with result["ids"], plus the
+        weighted total under "score".
+        """
+        ids = np.arange(self.size) if ids is None else np.asarray(ids, dtype=np.intp)
+        n = len(ids)
+        cca_prefs = set(map(str.lower, prefs.get("ccas") or []))
+        subj_prefs = set(map(str.lower, prefs.get("subjects") or []))
+        max_km = prefs.get("max_distance_km") or prefs.get("travel_km")
+
+        cca_score = self._match_ratio(self.cca_vocab, self.cca_matrix, cca_prefs, ids)
+        subj_score = self._match_ratio(self.subj_vocab, self.subj_matrix, subj_prefs, ids)
+
+        level_code = self.level_vocab.get(level, -2) if level else -2
+        level_score = (self.level_codes[ids] == level_code).astype(float)
+
+        distance_km = np.full(n, np.nan)
+        dist_score = np.zeros(n)
+        if max_km and user_lat is not None and user_lon is not None:
+            geo = self.spatial
+            distance_km = haversine_km(user_lat, user_lon, geo.lat[ids], geo.lon[ids])
+            known = ~np.isnan(distance_km)
+            # soft cap: full score at the doorstep, linear decay to 0 at max_km
+            dist_score[known] = np.maximum(0.0, 1.0 - (distance_km[known] / float(max_km)))
+
+        score = (
+            weights.get("cca", 0.2)       * cca_score +
+            weights.get("subjects", 0.25) * subj_score +
+            weights.get("level", 0.15)    * level_score +
+            weights.get("distance", 0.4)  * dist_score
+        )
+        return {
+            "ids": ids,
+            "score": score,
+            "distance_km": distance_km,
+            "distance_score": dist_score,
+            "level_score": level_score,
+            "cca_prefs": cca_prefs,
+            "subj_prefs": subj_prefs,
+        }
+
+    @staticmethod
+    def _matches(vocab: Vocabulary, bits: int, prefs: set[str]) -> list[str]:
+        out = []
+        for p in prefs:
+            i = vocab.id_of(p)
+            if i is not None and bits >> i & 1:
+                out.append(p)
+        return out
+
+    @staticmethod
+    def distance_km(j: int, scored: dict):
+        d = scored["distance_km"][j]
+        return round(float(d), 3) if not np.isnan(d) else None
+
+    def reasons(self, j: int, scored: dict, weights: dict | None = None) -> dict:
+        """
+        Explanation for the j-th scored row, in the shape the frontend expects.
+        `weights` is repeated in every explanation only when passed.
+        """
+        i = int(scored["ids"][j])
+        out = {
+            "cca_matches": self._matches(self.cca_vocab, self.cca_bits[i], scored["cca_prefs"]),
+            "subject_matches": self._matches(self.subj_vocab, self.subj_bits[i], scored["subj_prefs"]),
+            "level_match": bool(scored["level_score"][j] == 1.0),
+            "distance_km": self.distance_km(j, scored),
+            "distance_score": float(scored["distance_score"][j]),
+        }
+        if weights is not None:
+            out["weights"] = weights
+        out["cutoff_primary"] = self.cutoff_primary[i]
+        return out
@@ -0,0 +1,67 @@
+# services/school_record.py
+import sys
+
+# ------------------------------------------------------------------
+# Compact, immutable school record
+# ------------------------------------------------------------------
+# Only the columns the API serves are kept; the raw data.gov.sg row (30+
+# columns) is not. Enrichment (CCAs, subjects, cut-offs) lives in separate
+# indexes keyed by school name, never on the record.
+FIELDS = (
+    "school_name",
+    "postal_code",
+    "mainlevel_code",
+    "zone_code",
+    "type_code",
+    "address",
+    "telephone_no",
+    "email_address",
+    "url_address",
+)
+
+_FIELD_SET = frozenset(FIELDS)
+
+# few distinct values shared by hundreds of schools
+_INTERNED = {"mainlevel_code", "zone_code", "type_code"}
+
+
+def _clean(value) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+class SchoolRecord:
+    """
+    One school from the directory. Read-only; supports record["field"] and
+    record.get("field") so it can stand in for the old row dicts.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, **values):
+        for f in FIELDS:
+            v = _clean(values.get(f))
+            object.__setattr__(self, f, sys.intern(v) if f in _INTERNED else v)
+
+    @classmethod
+    def from_row(cls, row: dict) -> "SchoolRecord":
+        """Build from a raw school_info row."""
+        values = {f: row.get(f) for f in FIELDS}
+        values["url_address"] = row.get("url_address") or row.get("website")
+        return cls(**values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SchoolRecord is immutable")
+
+    def __getitem__(self, field: str):
+        if field not in _FIELD_SET:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field: str, default=None):
+        return getattr(self, field) if field in _FIELD_SET else default
+
+    def to_dict(self) -> dict:
+        return {f: getattr(self, f) for f in FIELDS}
+
+    def __repr__(self) -> str:
+        return f"SchoolRecord({self.school_name!r})"
@@ -0,0 +1,115 @@
+# services/search_index.py
+from services.school_record import SchoolRecord
+
+# ------------------------------------------------------------------
+# Bitmap filter index for /api/schools
+# ------------------------------------------------------------------
+# Every school gets an id (its position in the school list). Each filter value
+# maps to a Python int used as a bitmap of ids, so filters are ANDs and counts
+# are popcounts.
+_MAX_GRAM = 3
+
+
+def _grams(text: str, n: int):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _iter_ids(bitmap: int):
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+class SearchIndex:
+    """
+    Per-value bitmaps for zone_code, type_code and mainlevel_code, plus a
+    1..3-gram index over lower-case school names for substring search.
+    """
+
+    def __init__(self, items: list[SchoolRecord]):
+        self.items = items
+        self.all = (1 << len(items)) - 1
+        self.zones: dict[str, int] = {}
+        self.types: dict[str, int] = {}
+        self.levels: dict[str, int] = {}
+        self.grams: dict[str, int] = {}
+        self.names = []
+
+        for i, s in enumerate(items):
+            bit = 1 << i
+            for table, value in (
+                (self.zones, s.get("zone_code")),
+                (self.types, s.get("type_code")),
+                (self.levels, (s.get("mainlevel_code") or "").upper()),
+            ):
+                if value:
+                    table[value] = table.get(value, 0) | bit
+
+            name = (s.get("school_name") or "").lower()
+            self.names.append(name)
+            for n in range(1, _MAX_GRAM + 1):
+                for g in _grams(name, n):
+                    self.grams[g] = self.grams.get(g, 0) | bit
+
+    # ---------------------
+    # Filters
+    # ---------------------
+    def _name_bitmap(self, q: str) -> int:
+        if len(q) <= _MAX_GRAM:
+            return self.grams.get(q, 0)
+        bm = self.all
+        for g in _grams(q, _MAX_GRAM):
+            bm &= self.grams.get(g, 0)
+            if not bm:
+                return 0
+        # n-grams only narrow the candidates; confirm the full substring
+        for i in _iter_ids(bm):
+            if q not in self.names[i]:
+                bm &= ~(1 << i)
+        return bm
+
+    def _level_bitmap(self, level: str) -> int:
+        """mainlevel_code values containing the (normalized) level, e.g. MIXED → MIXED LEVEL."""
+        bm = 0
+        for value, bits in self.levels.items():
+            if level in value:
+                bm |= bits
+        return bm
+
+    def query(self, q: str = "", level: str | None = None, zone: str = "", type_code: str = "") -> int:
+        """Bitmap of the schools matching every given filter."""
+        bm = self.all
+        if zone:
+            bm &= self.zones.get(zone, 0)
+        if type_code:
+            bm &= self.types.get(type_code, 0)
+        if level:
+            bm &= self._level_bitmap(level)
+        if q and bm:
+            bm &= self._name_bitmap(q)
+        return bm
+
+    # ---------------------
+    # Results
+    # ---------------------
+    @staticmethod
+    def count(bitmap: int) -> int:
+        return bitmap.bit_count()
+
+    def page(self, bitmap: int, offset: int, limit: int) -> list[SchoolRecord]:
+        """Schools for one page of a result bitmap, in school-list order."""
+        out = []
+        for n, i in enumerate(_iter_ids(bitmap)):
+            if n >= offset + limit:
+                break
+            if n >= offset:
+                out.append(self.items[i])
+        return out
+
+    def facets(self, bitmap: int) -> dict:
+        """Per-value counts of zone, type and level within a result bitmap."""
+        return {
+            name: {value: (bitmap & bits).bit_count() for value, bits in sorted(table.items())}
+            for name, table in (("zone", self.zones), ("type", self.types), ("level", self.levels))
+        }
@@ -0,0 +1,107 @@
+# services/spatial.py
+import numpy as np
+
+# ------------------------------------------------------------------
+# Uniform grid over school coordinates (projected Singapore km)
+# ------------------------------------------------------------------
+EARTH_RADIUS_KM = 6371.0
+_REF_LAT = 1.35  # Singapore; an equirectangular projection is near-exact at this scale
+
+
+def haversine_km(lat1: float, lon1: float, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many (NaN where lat2/lon2 are NaN)."""
+    dlat = np.radians(lat2 - lat1)
+    dlon = np.radians(lon2 - lon1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * (2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+
+
+def _project(lat, lon):
+    x = EARTH_RADIUS_KM * np.radians(lon) * np.cos(np.radians(_REF_LAT))
+    y = EARTH_RADIUS_KM * np.radians(lat)
+    return x, y
+
+
+class GridIndex:
+    """
+    Buckets points into square cells of `cell_km` so radius and k-nearest
+    queries only look at the cells around the query point.
+    Points with NaN coordinates are left out of the index.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_km: float = 1.0):
+        self.lat = lat
+        self.lon = lon
+        self.cell_km = cell_km
+
+        ids = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        x, y = _project(lat[ids], lon[ids])
+        self.x = np.full(len(lat), np.nan)
+        self.y = np.full(len(lat), np.nan)
+        self.x[ids], self.y[ids] = x, y
+
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for i, cx, cy in zip(ids.tolist(), np.floor(x / cell_km).astype(int).tolist(), np.floor(y / cell_km).astype(int).tolist()):
+            self.cells.setdefault((cx, cy), []).append(i)
+        self.size = len(ids)
+
+        if self.cells:
+            xs, ys = zip(*self.cells)
+            self._bounds = (min(xs), max(xs), min(ys), max(ys))
+        else:
+            self._bounds = (0, -1, 0, -1)
+
+    def _cell_of(self, lat: float, lon: float) -> tuple[int, int]:
+        x, y = _project(lat, lon)
+        return int(np.floor(x / self.cell_km)), int(np.floor(y / self.cell_km))
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """Ids in the cells at Chebyshev distance exactly r from (cx, cy)."""
+        if r == 0:
+            return list(self.cells.get((cx, cy), ()))
+        out = []
+        for dx in range(-r, r + 1):
+            for dy in (-r, r):
+                out.extend(self.cells.get((cx + dx, cy + dy), ()))
+        for dy in range(-r + 1, r):
+            for dx in (-r, r):
+                out.extend(self.cells.get((cx + dx, cy + dy), ()))
+        return out
+
+    def within(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Sorted ids of the points within radius_km (great-circle) of the query."""
+        cx, cy = self._cell_of(lat, lon)
+        reach = int(np.ceil(radius_km / self.cell_km))
+        x0, x1, y0, y1 = self._bounds
+        cand = []
+        for gx in range(max(cx - reach, x0), min(cx + reach, x1) + 1):
+            for gy in range(max(cy - reach, y0), min(cy + reach, y1) + 1):
+                cand.extend(self.cells.get((gx, gy), ()))
+        if not cand:
+            return np.empty(0, dtype=np.intp)
+        cand = np.sort(np.array(cand, dtype=np.intp))
+        d = haversine_km(lat, lon, self.lat[cand], self.lon[cand])
+        return cand[d <= radius_km]
+
+    def nearest(self, lat: float, lon: float, k: int) -> list[tuple[int, float]]:
+        """The k closest points as [(id, distance_km)], nearest first."""
+        if k <= 0 or not self.size:
+            return []
+        cx, cy = self._cell_of(lat, lon)
+        qx, qy = _project(lat, lon)
+        x0, x1, y0, y1 = self._bounds
+        max_r = max(abs(cx - x0), abs(cx - x1), abs(cy - y0), abs(cy - y1))
+
+        cand: list[int] = []
+        for r in range(max_r + 1):
+            cand.extend(self._ring(cx, cy, r))
+            if len(cand) >= k:
+                # every unseen point is at least r cells away from the query
+                d = np.hypot(self.x[cand] - qx, self.y[cand] - qy)
+                if np.partition(d, k - 1)[k - 1] <= r * self.cell_km:
+                    break
+
+        ids = np.array(cand, dtype=np.intp)
+        d = haversine_km(lat, lon, self.lat[ids], self.lon[ids])
+        order = np.lexsort((ids, d))[:k]
+        return [(int(ids[j]), float(d[j])) for j in order]
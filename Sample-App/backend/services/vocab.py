@@ -0,0 +1,78 @@
+# services/vocab.py
+import numpy as np
+
+# ------------------------------------------------------------------
+# Interned CCA / subject vocabularies and per-school bitsets
+# ------------------------------------------------------------------
+# Every distinct term (case-insensitive) gets an integer id at ingest. A
+# school's offerings are one Python int with bit `id` set per term; the
+# scoring engine packs those into rows of uint64 words so a preference
+# match is AND + popcount.
+_WORD = 64
+_WORD_MASK = (1 << _WORD) - 1
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a (rows x words) uint64 array."""
+    if hasattr(np, "bitwise_count"):   # NumPy >= 2.0
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return _POPCOUNT8[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class Vocabulary:
+    """
+    Sorted, case-insensitive term list. `terms` holds one display spelling
+    per term, ids are positions in that list.
+    """
+
+    def __init__(self, terms):
+        variants: dict[str, set[str]] = {}
+        for t in terms:
+            t = (t or "").strip()
+            if t:
+                variants.setdefault(t.lower(), set()).add(t)
+        self.keys = sorted(variants)
+        self.terms = [min(variants[k]) for k in self.keys]
+        self.ids = {k: i for i, k in enumerate(self.keys)}
+        self.words = max(1, -(-len(self.keys) // _WORD))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def id_of(self, term: str):
+        return self.ids.get((term or "").strip().lower())
+
+    def bits(self, terms) -> int:
+        """Bitset (Python int) of the known terms; unknown ones are ignored."""
+        b = 0
+        for t in terms:
+            i = self.id_of(t)
+            if i is not None:
+                b |= 1 << i
+        return b
+
+    def to_words(self, bits: int) -> np.ndarray:
+        return np.array([(bits >> (_WORD * w)) & _WORD_MASK for w in range(self.words)], dtype=np.uint64)
+
+    def matrix(self, bitsets) -> np.ndarray:
+        """(len(bitsets) x words) uint64 array, one row per bitset."""
+        out = np.zeros((len(bitsets), self.words), dtype=np.uint64)
+        for r, bits in enumerate(bitsets):
+            w = 0
+            while bits:
+                out[r, w] = bits & _WORD_MASK
+                bits >>= _WORD
+                w += 1
+        return out
+
+    def counts(self, bitsets) -> list[int]:
+        """How many of the bitsets contain each term, indexed by id."""
+        counts = [0] * len(self.keys)
+        for bits in bitsets:
+            while bits:
+                low = bits & -bits
+                counts[low.bit_length() - 1] += 1
+                bits ^= low
+        return counts
@@ -0,0 +1,131 @@
+# tests/conftest.py
+"""
+Shared fixtures: a local stub for data.gov.sg / OneMap, with the backend's
+upstream URLs, snapshot directory and app.db pointed at it and at tmp_path.
+Run from Sample-App/backend:  python -m pytest tests
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+SCHOOLS = [
+    {
+        "school_name": f"TEST SCHOOL {i:03d}",
+        "postal_code": f"{100000 + i}",
+        "mainlevel_code": "SECONDARY",
+        "zone_code": "NORTH",
+        "type_code": "GOVERNMENT SCHOOL",
+        "address": f"{i} TEST ROAD",
+    }
+    for i in range(300)
+]
+# real datasets are never empty, and an empty one wouldn't parse as rows
+CCAS = [{"School_name": "TEST SCHOOL 000", "cca_grouping_desc": "CHOIR", "cca_generic_name": "choir"}]
+SUBJECTS = [{"School_Name": "TEST SCHOOL 000", "Subject_Desc": "SCIENCE"}]
+
+
+class Upstream:
+    """Stub data.gov.sg + OneMap. `hits` counts requests per path; `delay` slows every reply."""
+
+    def __init__(self, datasets: dict):
+        self.datasets = datasets
+        self.hits = Counter()
+        self.delay = 0.0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._reply(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def _reply(self, req):
+        url = urlparse(req.path)
+        self.hits[url.path] += 1
+        time.sleep(self.delay)
+        if url.path.startswith("/onemap"):
+            body = {"results": [{"LATITUDE": "1.3", "LONGITUDE": "103.8"}]}
+        else:
+            q = parse_qs(url.query)
+            rows = self.datasets.get(url.path.split("/")[-2], [])
+            offset = int(q.get("offset", ["0"])[0])
+            limit = int(q.get("limit", [str(len(rows))])[0])
+            body = {"code": 0, "data": {"rows": rows[offset:offset + limit], "total": len(rows)}}
+        raw = json.dumps(body).encode()
+        req.send_response(200)
+        req.send_header("Content-Type", "application/json")
+        req.send_header("Content-Length", str(len(raw)))
+        req.end_headers()
+        req.wfile.write(raw)
+
+
+def _reset_backend():
+    """Forget cached data and app.db connections between tests."""
+    import utils.db
+    from services import data_fetcher
+    from utils.cache import cache_stats, get_cache
+
+    for name in cache_stats():
+        get_cache(name).clear()
+    data_fetcher._failed_at.clear()
+    while not utils.db._pool.empty():
+        utils.db._pool.get_nowait().close()
+    conn = getattr(utils.db._local, "conn", None)
+    if conn is not None:
+        conn.close()
+        utils.db._local.conn = None
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """A running stub upstream; the backend modules are patched to use it."""
+    import utils.db
+    import utils.snapshot
+    from models.migrations import migrate
+    from services import data_fetcher, geocoder
+
+    stub = Upstream({
+        data_fetcher.DATASETS["school_info"]: SCHOOLS,
+        data_fetcher.DATASETS["ccas"]: CCAS,
+        data_fetcher.DATASETS["subjects"]: SUBJECTS,
+    })
+    threading.Thread(target=stub.server.serve_forever, daemon=True).start()
+
+    # these are read into module constants at import, so patch the modules
+    monkeypatch.setattr(data_fetcher, "DATA_GOV_API", f"{stub.base}/datagov")
+    monkeypatch.setattr(data_fetcher, "OFFLINE", False)
+    monkeypatch.setattr(geocoder, "ONEMAP_SEARCH_URL", f"{stub.base}/onemap/search")
+    monkeypatch.setattr(geocoder, "OFFLINE", False)
+    monkeypatch.setattr(geocoder, "_precompute_failed_at", 0.0)
+    monkeypatch.setattr(utils.snapshot, "SNAPSHOT_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr(utils.db, "DB_PATH", tmp_path / "app.db")
+    _reset_backend()
+    migrate(utils.db.thread_db())
+
+    yield stub
+
+    stub.server.shutdown()
+    stub.server.server_close()
+    _reset_backend()
+
+
+@pytest.fixture
+def app(upstream):
+    """A Flask app wired to the stub upstream."""
+    from app import create_app
+
+    return create_app()
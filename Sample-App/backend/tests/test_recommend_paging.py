@@ -0,0 +1,68 @@
+# tests/test_recommend_paging.py
+"""Cursor pages of one ranking stay consistent under concurrent requests."""
+import threading
+import time
+
+from conftest import SCHOOLS
+
+
+class _InterleavedSnapshot(dict):
+    """
+    A ranking snapshot that forces the racy interleaving of two "order"
+    writes: the deep ordering is stored only once the shallow one is ready,
+    and the shallow one lands while the deep request is still on its way
+    out. Timeouts keep a correctly locked _top_k from waiting forever.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.shallow_ready = threading.Event()
+        self.deep_stored = threading.Event()
+
+    def __setitem__(self, key, value):
+        if key != "order" or len(value) <= 1:
+            return super().__setitem__(key, value)
+        if len(value) < 100:
+            self.shallow_ready.set()
+            self.deep_stored.wait(1)
+            super().__setitem__(key, value)
+        else:
+            self.shallow_ready.wait(1)
+            super().__setitem__(key, value)
+            self.deep_stored.set()
+            time.sleep(0.05)
+
+
+def test_concurrent_pages_of_one_ranking(app, monkeypatch):
+    import routes.schools as schools
+    from routes.schools import _decode_cursor, _encode_cursor
+
+    build = schools._build_ranking
+    monkeypatch.setattr(schools, "_build_ranking", lambda *a: _InterleavedSnapshot(build(*a)))
+
+    base = "/api/schools/recommend?level=secondary&subjects=Math"
+    first = app.test_client().get(base + "&limit=1").get_json()
+    key, _ = _decode_cursor(first["next_cursor"])
+
+    barrier = threading.Barrier(2)
+    replies = {}
+
+    def get(name, url):
+        client = app.test_client()
+        barrier.wait()
+        replies[name] = client.get(url).get_json()
+
+    threads = [
+        threading.Thread(target=get, args=("shallow", base + "&limit=50")),
+        threading.Thread(target=get, args=("deep", base + f"&limit=100&cursor={_encode_cursor(key, 150)}")),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # every school scores the same, so the order is by name
+    names = sorted(s["school_name"] for s in SCHOOLS)
+    assert [i["school_name"] for i in replies["shallow"]["items"]] == names[:50]
+    assert [i["school_name"] for i in replies["deep"]["items"]] == names[150:250]
+    assert replies["deep"]["next_cursor"] == _encode_cursor(key, 250)
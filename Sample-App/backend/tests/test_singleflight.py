@@ -0,0 +1,48 @@
+# tests/test_singleflight.py
+"""N concurrent cache misses for the same key cause exactly one upstream fetch."""
+import threading
+
+N_CALLERS = 20
+UPSTREAM_DELAY_SEC = 0.3   # long enough that every caller arrives mid-flight
+
+
+def _run_concurrently(func, n=N_CALLERS):
+    barrier = threading.Barrier(n)
+    results, errors = [], []
+
+    def call():
+        barrier.wait()
+        try:
+            results.append(func())
+        except Exception as e:   # surfaced by the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    return results
+
+
+def test_concurrent_get_schools_fetch_once(upstream):
+    from conftest import SCHOOLS
+    from services.data_fetcher import DATASETS, get_schools
+
+    upstream.delay = UPSTREAM_DELAY_SEC
+    results = _run_concurrently(get_schools)
+
+    path = f"/datagov/datasets/{DATASETS['school_info']}/list-rows"
+    assert upstream.hits[path] == 1
+    assert all(len(r) == len(SCHOOLS) for r in results)
+
+
+def test_concurrent_geocode_fetch_once(upstream):
+    from services.geocoder import geocode_postal
+
+    upstream.delay = UPSTREAM_DELAY_SEC
+    results = _run_concurrently(lambda: geocode_postal("200640"))
+
+    assert upstream.hits["/onemap/search"] == 1
+    assert set(results) == {(1.3, 103.8)}
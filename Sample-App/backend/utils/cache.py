@@ -1,11 +1,143 @@
+import sys
+import threading
 import time
+from collections import OrderedDict
+
+# ------------------------------------------------------------------
+# Namespaced TTL + LRU cache shared by the whole backend
+# ------------------------------------------------------------------
+_MISSING = object()
+
+
+def _approx_size(value, depth: int = 3) -> int:
+    """
+    Cheap byte estimate: walks up to `depth` levels of dicts/lists and
+    extrapolates from the first 64 items of each container.
+    """
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        sample = list(value.items())[:64]
+        per = sum(sys.getsizeof(k) + _approx_size(v, depth - 1) for k, v in sample)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        sample = list(value)[:64] if isinstance(value, (set, frozenset)) else value[:64]
+        per = sum(_approx_size(v, depth - 1) for v in sample)
+    else:
+        return size
+    return size + per * len(value) // max(1, len(sample))
+
+
+class TTLCache:
+    """
+    Thread-safe cache with per-entry TTL and LRU eviction.
+    Bounded by max_entries and/or max_bytes (sizes are estimates unless the
+    caller passes size= to set()). Keeps hit/miss/eviction counters.
+    """
+
+    def __init__(self, name: str, ttl: float | None = None, max_entries: int | None = None, max_bytes: int | None = None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict = OrderedDict()   # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _drop(self, key) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at is not None and time.time() >= expires_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = _MISSING, size: int | None = None) -> None:
+        ttl = self.ttl if ttl is _MISSING else ttl
+        size = _approx_size(value) if size is None else size
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, time.time() + ttl if ttl is not None else None, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        # never evict the entry that was just written
+        while len(self._data) > 1 and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._data)))
+            self.evictions += 1
+
+    def get_or_set(self, key, func, ttl: float | None = _MISSING):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = func()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def delete(self, key) -> None:
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# ---------------------
+# Namespace registry
+# ---------------------
+_namespaces: dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name: str, ttl: float | None = None, max_entries: int | None = None, max_bytes: int | None = None) -> TTLCache:
+    """Return the cache for a namespace, creating it with these limits on first use."""
+    with _registry_lock:
+        cache = _namespaces.get(name)
+        if cache is None:
+            cache = _namespaces[name] = TTLCache(name, ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        return cache
+
+
+def cache_stats() -> dict:
+    """Counters for every namespace, e.g. for /health/cache."""
+    with _registry_lock:
+        caches = list(_namespaces.values())
+    return {c.name: c.stats() for c in caches}
 
-_cache = {}
 
 def cached_fetch(key, func, ttl=600):
-    now = time.time()
-    if key in _cache and now - _cache[key]["ts"] < ttl:
-        return _cache[key]["data"]
-    data = func()
-    _cache[key] = {"data": data, "ts": now}
-    return data
+    return get_cache("misc", max_entries=256).get_or_set(key, func, ttl=ttl)
@@ -0,0 +1,87 @@
+import gzip
+import os
+from flask import request
+from utils.cache import get_cache
+
+try:
+    import brotli   # in requirements.txt; gzip only if it is missing
+except ImportError:
+    brotli = None
+
+# ------------------------------------------------------------------
+# Response compression
+# ------------------------------------------------------------------
+# JSON / text bodies of at least COMPRESS_MIN_BYTES go out brotli- or
+# gzip-encoded when the client accepts it. Strong ETags are weakened on
+# compressed responses (as nginx does): the bytes differ per encoding, and
+# If-None-Match compares weakly, so revalidation keeps working.
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5   # well below the max (11), which is too slow per request
+
+# a strong ETag names exact bytes, so their compressed form can be reused
+_compressed = get_cache("compressed", max_entries=512, max_bytes=32 * 1024 * 1024)   # (etag, encoding) -> bytes
+
+
+def _compressible_type(mimetype: str) -> bool:
+    return mimetype == "application/json" or mimetype.startswith("text/")
+
+
+def _compressible(response) -> bool:
+    return (
+        200 <= response.status_code < 300
+        and response.status_code != 204
+        and not response.direct_passthrough
+        and "Content-Encoding" not in response.headers
+        and _compressible_type(response.mimetype)
+    )
+
+
+def _choose_encoding(accept) -> str | None:
+    if brotli is not None and accept["br"]:
+        return "br"
+    if accept["gzip"]:
+        return "gzip"
+    return None
+
+
+def compressed_encoding(mimetype: str, size: int) -> str | None:
+    """Content-Encoding compress_response would give a body of this type and size on the current request."""
+    if size < COMPRESS_MIN_BYTES or not _compressible_type(mimetype):
+        return None
+    return _choose_encoding(request.accept_encodings)
+
+
+def compress_response(response):
+    if not _compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    encoding = _choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    etag, weak = response.get_etag()
+    key = (etag, encoding) if etag and not weak else None
+    data = _compressed.get(key) if key else None
+    if data is None:
+        if encoding == "br":
+            data = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            data = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        if key:
+            _compressed.set(key, data, size=len(data))
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+
+    if key:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress responses of every blueprint (call in create_app)."""
+    app.after_request(compress_response)
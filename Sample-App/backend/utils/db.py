@@ -1,12 +1,65 @@
+import queue
 import sqlite3
+import threading
 from pathlib import Path
 from flask import g
 
 DB_PATH = Path(__file__).resolve().parent.parent / "app.db"
 
+# ------------------------------------------------------------------
+# Connection reuse
+# ------------------------------------------------------------------
+# Opening app.db costs a file open plus a schema parse, and every connection
+# keeps its own prepared-statement cache, so connections are reused:
+# - requests check one out of a shared pool (the dev server starts a new
+#   thread per request, so thread-locals alone would never be reused)
+# - long-lived worker threads (geocoding) keep one per thread
+POOL_SIZE = 8               # idle connections kept for requests
+BUSY_TIMEOUT_MS = 5000
+CACHED_STATEMENTS = 256
+
+_pool: queue.LifoQueue = queue.LifoQueue(maxsize=POOL_SIZE)
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        cached_statements=CACHED_STATEMENTS,
+        check_same_thread=False,   # only ever used by one thread at a time
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")       # readers don't block the writer
+    conn.execute("PRAGMA synchronous=NORMAL")     # safe with WAL, no fsync per commit
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+
 def get_db():
+    """The request's connection, checked out of the pool on first use."""
     if "db" not in g:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        g.db = conn
+        try:
+            g.db = _pool.get_nowait()
+        except queue.Empty:
+            g.db = _connect()
     return g.db
+
+
+def release_db(conn: sqlite3.Connection) -> None:
+    """Return a request's connection to the pool (teardown). Uncommitted work is rolled back."""
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        _pool.put_nowait(conn)
+    except (queue.Full, sqlite3.Error):
+        conn.close()
+
+
+def thread_db() -> sqlite3.Connection:
+    """One connection per thread, for work outside request contexts."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+    return conn
@@ -0,0 +1,35 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ------------------------------------------------------------------
+# Shared HTTP session for data.gov.sg + OneMap
+# ------------------------------------------------------------------
+# Both sessions keep connections alive between requests (no new TCP/TLS
+# handshake per page).
+# - session: background work (dataset downloads, geocode precompute);
+#   retries idempotent GETs on connection errors and 429/5xx, honouring
+#   Retry-After
+# - interactive_session: lookups a user request waits on; never retries,
+#   so a request is bounded by one timeout instead of several timeouts
+#   plus backoff or an uncapped Retry-After sleep
+POOL_SIZE = 16
+
+
+def _make_session(retry) -> requests.Session:
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+session = _make_session(Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,  # hand the last response back; callers use raise_for_status()
+))
+interactive_session = _make_session(Retry(total=0, read=False, redirect=3, raise_on_status=False))
@@ -0,0 +1,71 @@
+import threading
+
+# ------------------------------------------------------------------
+# Per-key request coalescing ("single flight")
+# ------------------------------------------------------------------
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers that arrive while a call
+    for the same key is in flight wait for it and share its result (or error)
+    instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        return self._run(key, call, func)
+
+    def start(self, key, func) -> bool:
+        """
+        Run func for key in a daemon thread unless a call for key is already
+        in flight. Returns True if a new call was started.
+        """
+        with self._lock:
+            if key in self._calls:
+                return False
+            call = self._calls[key] = _Call()
+
+        def background():
+            try:
+                self._run(key, call, func)
+            except Exception as e:
+                print(f"⚠️ Background call {key!r} failed: {e}")
+
+        threading.Thread(target=background, name=f"singleflight-{key}", daemon=True).start()
+        return True
+
+    def _run(self, key, call: _Call, func):
+        try:
+            call.value = func()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
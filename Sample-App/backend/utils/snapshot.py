@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+# ------------------------------------------------------------------
+# On-disk dataset snapshots + offline mode
+# ------------------------------------------------------------------
+# Each fetched dataset is written to SNAPSHOT_DIR/<dataset id>.json.gz so a
+# restart can serve it straight away. With DATA_OFFLINE=1 nothing is fetched:
+# data comes from the snapshots, else from the DATA_FIXTURE file.
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SNAPSHOT_DIR = Path(os.environ.get("DATA_SNAPSHOT_DIR", BACKEND_DIR / "data_snapshots"))
+FIXTURE_PATH = Path(os.environ.get("DATA_FIXTURE", BACKEND_DIR / "sample_schools.json"))
+OFFLINE = os.environ.get("DATA_OFFLINE", "").strip().lower() in {"1", "true", "yes"}
+
+SNAPSHOT_FORMAT = 1
+
+
+def _path(dataset_id: str) -> Path:
+    return SNAPSHOT_DIR / f"{dataset_id}.json.gz"
+
+
+def rows_version(raw: bytes) -> str:
+    """Short content hash, changes whenever the rows do."""
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def save_snapshot(dataset_id: str, rows: list, fetched_at: float | None = None) -> str:
+    """Write rows atomically; returns the snapshot version."""
+    raw = json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode()
+    version = rows_version(raw)
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "dataset_id": dataset_id,
+        "version": version,
+        "fetched_at": fetched_at or time.time(),
+        "count": len(rows),
+    }).encode()
+
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = _path(dataset_id).with_suffix(".tmp")
+    # first line is the header, second line the rows
+    with gzip.open(tmp, "wb", compresslevel=5) as f:
+        f.write(header + b"\n" + raw)
+    os.replace(tmp, _path(dataset_id))
+    return version
+
+
+def load_snapshot(dataset_id: str) -> dict | None:
+    """{"data", "timestamp", "version"} from disk, or None if missing/unreadable."""
+    path = _path(dataset_id)
+    if not path.exists():
+        return None
+    try:
+        with gzip.open(path, "rb") as f:
+            header, raw = f.read().split(b"\n", 1)
+        meta = json.loads(header)
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            return None
+        return {"data": json.loads(raw), "timestamp": meta["fetched_at"], "version": meta["version"]}
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable snapshot {path.name}: {e}")
+        return None
+
+
+def load_fixture(name: str) -> dict | None:
+    """
+    Rows for a dataset from the fixture file. The file is either a list of
+    school_info rows (like sample_schools.json; other datasets are then
+    empty) or {dataset name: rows}.
+    """
+    try:
+        raw = FIXTURE_PATH.read_bytes()
+    except OSError:
+        return None
+    fixture = json.loads(raw)
+    if isinstance(fixture, dict):
+        rows = fixture.get(name)
+    else:
+        rows = fixture if name == "school_info" else []
+    if rows is None:
+        return None
+    return {"data": rows, "timestamp": FIXTURE_PATH.stat().st_mtime, "version": rows_version(raw)}
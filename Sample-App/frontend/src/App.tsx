@@ -10,6 +10,7 @@ import { getPreferences } from "./lib/api"; // ADD THIS IMPORT
 import { Header } from "./components/layout/Header";
 import { ExploreTab } from "./components/tabs/ExploreTab";
 import { SavedTab } from "./components/tabs/SavedTab";
+import { SavedSchoolsProvider } from "./components/context/SavedSchoolsContext";
 import { ProfileTab } from "./components/tabs/ProfileTab";
 import { SchoolDetails } from "./components/SchoolDetails";
 import { AuthModal } from "./components/AuthModal";
@@ -159,6 +160,7 @@ useEffect(() => {
   const onRequireAuth = () => setShowAuth(true);
 
   return (
+    <SavedSchoolsProvider userId={user?.id ?? null}>
     <div className="min-h-screen flex flex-col">
       <header className="border-b">
         <div className="p-4 flex items-center justify-between gap-4">
@@ -323,5 +325,6 @@ useEffect(() => {
 
       <footer className="text-center text-xs text-muted py-4 border-t">© SchoolFit</footer>
     </div>
+    </SavedSchoolsProvider>
   );
 }
\ No newline at end of file
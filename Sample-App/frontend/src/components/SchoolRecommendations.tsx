@@ -30,6 +30,9 @@ export const SchoolRecommendations: React.FC<{
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [homePostal, setHomePostal] = useState<string | null>(null);
+  // server-side paging: further pages are fetched only when "Load more" needs them
+  const [more, setMore] = useState<{ query: string; cursor: string } | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const { addSchool, savedSchools, removeSchool } = useSavedSchools();
   const savedNames = useMemo(
@@ -51,6 +54,7 @@ export const SchoolRecommendations: React.FC<{
           setError(r.error);
         } else {
           setItems(r.items || []);
+          setMore(r.next_cursor && r.query ? { query: r.query, cursor: r.next_cursor } : null);
           // if your backend returns this, show it; otherwise it's fine to stay null
           setHomePostal(r.home_postal_used || r.home_postal || null);
         }
@@ -75,9 +79,30 @@ export const SchoolRecommendations: React.FC<{
     [items, minScore]
   );
 
-  const canLoadMore = visible < filtered.length;
+  // items arrive best-first, so once the last one is below minScore no later page can qualify
+  const lastScore = items.length ? items[items.length - 1]?.score_percent ?? 0 : 0;
+  const serverHasMore = !!more && lastScore >= minScore;
+  const canLoadMore = visible < filtered.length || serverHasMore;
   const shown = filtered.slice(0, visible);
 
+  const loadMore = async () => {
+    const target = visible + PAGE_SIZE;
+    setVisible(target);
+    if (target <= filtered.length || !serverHasMore || loadingMore || !more) return;
+    setLoadingMore(true);
+    try {
+      const r = await getRecommendations(more);
+      if (r.error) {
+        setError(r.error);
+        return;
+      }
+      setItems((prev) => [...prev, ...r.items]);
+      setMore(r.next_cursor ? { query: more.query, cursor: r.next_cursor } : null);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) return <Card className="p-4">Loading personalized recommendations…</Card>;
   if (error) return <Card className="p-4 text-red-600">Error: {error}</Card>;
 
@@ -211,7 +236,7 @@ export const SchoolRecommendations: React.FC<{
 
       {/* Footer / counts */}
       <div className="text-sm text-muted-foreground">
-        Showing {shown.length} of {filtered.length} recommended schools
+        Showing {shown.length} of {filtered.length}{serverHasMore ? "+" : ""} recommended schools
         {filtered.length === 0 && items.length > 0 && (
           <span className="text-orange-600 ml-2">
             (no items ≥ {minScore}% match)
@@ -224,9 +249,10 @@ export const SchoolRecommendations: React.FC<{
         <Button
           className="w-full mt-2"
           variant="outline"
-          onClick={() => setVisible((v) => v + PAGE_SIZE)}
+          disabled={loadingMore}
+          onClick={loadMore}
         >
-          Load more
+          {loadingMore ? "Loading…" : "Load more"}
         </Button>
       )}
     </Card>
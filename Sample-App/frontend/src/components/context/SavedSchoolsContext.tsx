@@ -1,5 +1,6 @@
 // src/context/SavedSchoolsContext.tsx
-import React, { createContext, useContext, useEffect, useMemo, useState } from "react";
+import React, { createContext, useContext, useEffect, useMemo, useRef, useState } from "react";
+import { addFavorite, getFavorites, removeFavorite, setFavorites } from "../../lib/api";
 
 export interface SavedSchool {
   school_name: string;
@@ -7,6 +8,7 @@ export interface SavedSchool {
   mainlevel_code?: string;
   zone_code?: string;
   cutoff_primary?: string | null;
+  cutoff_points?: Record<string, string> | null;
 }
 
 interface Ctx {
@@ -56,27 +58,68 @@ export const SavedSchoolsProvider: React.FC<
     setSavedSchools(loadSaved(userId));
   }, [userId]);
 
+  // logged in: the server list (full school cards) wins; anything saved
+  // while logged out is merged into it once
+  useEffect(() => {
+    if (userId == null) return;
+    let cancelled = false;
+    (async () => {
+      try {
+        let { items } = await getFavorites();
+        const extra = loadSaved(null).filter(
+          (a) => !items.some((s) => s.school_name === a.school_name)
+        );
+        if (extra.length) {
+          ({ items } = await setFavorites([...items, ...extra].map((s) => s.school_name)));
+          persist(null, []);
+        }
+        if (!cancelled) setSavedSchools(items);
+      } catch {
+        // offline / session expired: keep the cached list
+      }
+    })();
+    return () => {
+      cancelled = true;
+    };
+  }, [userId]);
+
   // persist whenever this user's list changes
   useEffect(() => {
     persist(userId, savedSchools);
   }, [userId, savedSchools]);
 
+  // apply the server's list after a change; only the latest reply counts
+  const lastSync = useRef(0);
+  const sync = (req: Promise<{ items: SavedSchool[] }>) => {
+    const n = ++lastSync.current;
+    req
+      .then(({ items }) => {
+        if (n === lastSync.current) setSavedSchools(items);
+      })
+      .catch(() => {});
+  };
+
   const addSchool = (school: SavedSchool) => {
     setSavedSchools((prev) => {
       if (prev.some((s) => s.school_name === school.school_name)) return prev;
       return [...prev, school];
     });
+    if (userId != null) sync(addFavorite(school.school_name));
   };
 
   const removeSchool = (schoolName: string) => {
     setSavedSchools((prev) => prev.filter((s) => s.school_name !== schoolName));
+    if (userId != null) sync(removeFavorite(schoolName));
   };
 
-  const clearAll = () => setSavedSchools([]);
+  const clearAll = () => {
+    setSavedSchools([]);
+    if (userId != null) sync(setFavorites([]));
+  };
 
   const value = useMemo(
     () => ({ savedSchools, addSchool, removeSchool, clearAll }),
-    [savedSchools]
+    [savedSchools, userId]
   );
 
   return (
@@ -1,6 +1,6 @@
 // src/hooks/useCutoffDetails.ts
 import { useEffect, useState } from "react";
-import { getSchoolDetails } from "../../lib/api";
+import { getSchoolDetailsBatch, type DetailsBatchEntry } from "../../lib/api";
 
 type CutoffKey =
   | "POSTING GROUP 3 (EXPRESS)"
@@ -28,13 +28,15 @@ const ORDER: CutoffKey[] = [
   "POSTING GROUP 1 AFFILIATED",
 ];
 
+const BATCH_SIZE = 100; // names per /details:batch request
+
 const isNA = (v?: string | null) => {
   if (!v) return true;
   const s = String(v).trim().toUpperCase();
   return s === "N/A" || s === "NA" || s === "-" || s === "";
 };
 
-function summarizeCutoffs(
+export function summarizeCutoffs(
   cutoff_points?: Partial<Record<CutoffKey, string>> | null,
   level?: string
 ): string | null {
@@ -72,26 +74,25 @@ export function useCutoffDetails(items: Input) {
     );
 
     const run = async () => {
-      const chunk = async (names: string[]) => {
-        await Promise.all(
-          names.map(async (n) => {
-            try {
-              const d = await getSchoolDetails(n);
-              if (cancelled) return;
-              const line = summarizeCutoffs(d?.cutoff_points, nameToLevel[n]);
-              setCache((prev) => ({
-                ...prev,
-                [n]: { cutoffLine: line, fetched: true },
-              }));
-            } catch {
-              if (cancelled) return;
-              setCache((prev) => ({ ...prev, [n]: { fetched: true } }));
-            }
-          })
-        );
-      };
-      for (let i = 0; i < toFetch.length && !cancelled; i += 8) {
-        await chunk(toFetch.slice(i, i + 8));
+      for (let i = 0; i < toFetch.length && !cancelled; i += BATCH_SIZE) {
+        const names = toFetch.slice(i, i + BATCH_SIZE);
+        let found: Record<string, DetailsBatchEntry> = {};
+        try {
+          found = await getSchoolDetailsBatch(names);
+        } catch {
+          // mark as fetched anyway; the card just shows no cut-offs
+        }
+        if (cancelled) return;
+        setCache((prev) => {
+          const next = { ...prev };
+          for (const n of names) {
+            const e = found[n];
+            next[n] = e?.ok
+              ? { cutoffLine: summarizeCutoffs(e.item?.cutoff_points, nameToLevel[n]), fetched: true }
+              : { fetched: true };
+          }
+          return next;
+        });
       }
     };
 
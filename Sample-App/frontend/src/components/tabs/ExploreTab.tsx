@@ -1,6 +1,6 @@
 // src/components/tabs/ExploreTab.tsx
 import React, { useState, useEffect } from "react";
-import { searchSchools, type School, getSchoolDetails } from "../../lib/api";
+import { searchSchools, type School, getSchoolDetailsBatch, type DetailsBatchEntry } from "../../lib/api";
 import { Button } from "../ui/button";
 import { Badge } from "../ui/badge";
 import { Card } from "../ui/card";
@@ -147,28 +147,26 @@ export const ExploreTab: React.FC<ExploreTabProps> = ({
     let cancelled = false;
 
     (async () => {
-      // limit concurrency a little
-      const batch = async (names: string[]) => {
-        await Promise.all(
-          names.map(async (n) => {
-            try {
-              const d = await getSchoolDetails(n);
-              if (cancelled) return;
-              setDetailsCache((prev) => ({
-                ...prev,
-                [n]: { cutoff_points: d?.cutoff_points ?? null, fetched: true },
-              }));
-            } catch {
-              if (cancelled) return;
-              setDetailsCache((prev) => ({ ...prev, [n]: { fetched: true } }));
-            }
-          })
-        );
-      };
-
-      // chunk by 8
-      for (let i = 0; i < toFetch.length && !cancelled; i += 8) {
-        await batch(toFetch.slice(i, i + 8));
+      // one /details:batch request per 100 names (a page is usually one request)
+      for (let i = 0; i < toFetch.length && !cancelled; i += 100) {
+        const names = toFetch.slice(i, i + 100);
+        let found: Record<string, DetailsBatchEntry> = {};
+        try {
+          found = await getSchoolDetailsBatch(names);
+        } catch {
+          // fall through: mark as fetched without cut-offs
+        }
+        if (cancelled) return;
+        setDetailsCache((prev) => {
+          const next = { ...prev };
+          for (const n of names) {
+            const e = found[n];
+            next[n] = e?.ok
+              ? { cutoff_points: e.item?.cutoff_points ?? null, fetched: true }
+              : { fetched: true };
+          }
+          return next;
+        });
       }
     })();
 
@@ -1,10 +1,10 @@
 // src/components/tabs/SavedTab.tsx
-import React from "react";
+import React, { useMemo } from "react";
 import { Card } from "../ui/card";
 import { Badge } from "../ui/badge";
 import { useSavedSchools } from "../context/SavedSchoolsContext";
 import { HeartToggle } from "../HeartToggle";
-import { useCutoffDetails } from "../hooks/useCutoffDetails";
+import { summarizeCutoffs, useCutoffDetails } from "../hooks/useCutoffDetails";
 
 export const SavedTab: React.FC<{
   user: any;
@@ -13,12 +13,15 @@ export const SavedTab: React.FC<{
 }> = ({ user, onViewDetails, onRequireAuth }) => {
   const { savedSchools, removeSchool } = useSavedSchools();
 
-  const details = useCutoffDetails(
-    savedSchools.map((s) => ({
-      school_name: s.school_name,
-      mainlevel_code: (s as any).mainlevel_code,
-    }))
+  // server cards already carry cut-offs; only cards saved before that need a lookup
+  const missing = useMemo(
+    () =>
+      savedSchools
+        .filter((s) => !s.cutoff_points)
+        .map((s) => ({ school_name: s.school_name, mainlevel_code: s.mainlevel_code })),
+    [savedSchools]
   );
+  const details = useCutoffDetails(missing);
 
   if (!savedSchools.length) {
     return (
@@ -31,7 +34,9 @@ export const SavedTab: React.FC<{
   return (
     <div className="grid gap-4">
       {savedSchools.map((s, i) => {
-        const cut = details[s.school_name]?.cutoffLine;
+        const cut = s.cutoff_points
+          ? summarizeCutoffs(s.cutoff_points, s.mainlevel_code)
+          : details[s.school_name]?.cutoffLine;
         return (
           <Card
             key={`${s.school_name}-${i}`}
@@ -155,8 +155,86 @@ export async function getSchoolDetails(name: string) {
   return data.item;
 }
 
-export const getRecommendations = async (): Promise<{ items: any[], error?: string }> => {
+// Details for many schools in one request (server limit: 100 names).
+// Keyed by name; each entry is what getSchoolDetails' endpoint returns.
+export type DetailsBatchEntry = { ok: true; item: any } | { ok: false; error: string };
+
+export async function getSchoolDetailsBatch(names: string[]): Promise<Record<string, DetailsBatchEntry>> {
+  const r = await fetch(`${BACKEND_BASE}/api/schools/details:batch`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    credentials: "include",
+    body: JSON.stringify({ names }),
+  });
+  const data = await handleResponse(r);
+  return data.items;
+}
+
+// --- Favorites (saved schools) ---
+// Every call returns the full saved list as school cards (incl. cut-offs).
+export type SchoolCard = School & {
+  cutoff_points?: Record<string, string> | null;
+};
+
+export async function getFavorites(): Promise<{ items: SchoolCard[] }> {
+  const r = await fetch(`${BACKEND_BASE}/api/favorites`, { credentials: "include" });
+  return handleResponse(r);
+}
+
+export async function addFavorite(school_name: string): Promise<{ items: SchoolCard[] }> {
+  const r = await fetch(`${BACKEND_BASE}/api/favorites`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    credentials: "include",
+    body: JSON.stringify({ school_name }),
+  });
+  return handleResponse(r);
+}
+
+export async function removeFavorite(school_name: string): Promise<{ items: SchoolCard[] }> {
+  const r = await fetch(`${BACKEND_BASE}/api/favorites?school_name=` + encodeURIComponent(school_name), {
+    method: "DELETE",
+    credentials: "include",
+  });
+  return handleResponse(r);
+}
+
+export async function setFavorites(school_names: string[]): Promise<{ items: SchoolCard[]; ignored: unknown[] }> {
+  const r = await fetch(`${BACKEND_BASE}/api/favorites`, {
+    method: "PUT",
+    headers: { "Content-Type": "application/json" },
+    credentials: "include",
+    body: JSON.stringify({ school_names }),
+  });
+  return handleResponse(r);
+}
+
+export type RecommendationPage = {
+  items: any[];
+  next_cursor?: string | null;
+  query?: string;
+  error?: string;
+};
+
+/**
+ * One page of recommendations, best first. Call without arguments for the
+ * first page (built from the user's saved preferences); pass the returned
+ * `query` and `next_cursor` back in to fetch the next one.
+ */
+export const getRecommendations = async (
+  more?: { query: string; cursor: string }
+): Promise<RecommendationPage> => {
   try {
+    if (more) {
+      const r = await fetch(
+        `/api/schools/recommend?${more.query}&cursor=${encodeURIComponent(more.cursor)}`,
+        { method: 'GET', credentials: 'include' }
+      );
+      const page = await r.json().catch(() => ({}));
+      if (!r.ok) return { items: [], error: page.error || `${r.status} ${r.statusText}` };
+      return { items: page.items || [], next_cursor: page.next_cursor, query: more.query };
+    }
+
     const prefsResponse = await fetch('/api/preferences', {
       method: 'GET',
       credentials: 'include',
@@ -185,7 +263,9 @@ export const getRecommendations = async (): Promise<{ items: any[], error?: stri
     if (subjects.length > 0) params.append('subjects', subjects.join(','));
     if (ccas.length > 0) params.append('ccas', ccas.join(','));
 
-    const url = `/api/schools/recommend?${params.toString()}`;
+    params.append('limit', '50');
+    const query = params.toString();
+    const url = `/api/schools/recommend?${query}`;
    
 
     // Use GET request as your backend expects (like your working example)
@@ -210,6 +290,7 @@ export const getRecommendations = async (): Promise<{ items: any[], error?: stri
     }
 
     const data = await response.json();
+
     console.log('Recommendation response received:', {
       itemCount: data.items?.length,
       homePostalUsed: data.home_postal_used,
@@ -221,9 +302,11 @@ export const getRecommendations = async (): Promise<{ items: any[], error?: stri
       } : null
     });
 
-    // Return ALL items without filtering
+    // First page only; the caller asks for more with next_cursor
     return {
       items: data.items || [],
+      next_cursor: data.next_cursor,
+      query,
     };
     
   } catch (error: any) {
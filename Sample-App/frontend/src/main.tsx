@@ -3,12 +3,9 @@ import React from "react";
 import ReactDOM from "react-dom/client";
 import App from "./App";
 import "./styles.css";
-import { SavedSchoolsProvider } from "./components/context/SavedSchoolsContext"; // ✅ import provider
 
 ReactDOM.createRoot(document.getElementById("root")!).render(
   <React.StrictMode>
-    <SavedSchoolsProvider>
-      <App />
-    </SavedSchoolsProvider>
+    <App />
   </React.StrictMode>
 );